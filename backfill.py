@@ -0,0 +1,39 @@
+import argparse
+import os
+from pathlib import Path
+
+from main import DATA_DIR, PARSE_CACHE_DIR, REMOTE_CACHE_DIR, REMOTE_DATA_URL
+from saleor_deprecations import DataStore, HistoryStore, backfill_history
+from saleor_deprecations.git_history import SCHEMA_PATH, get_git_tags
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Backfill snapshot history from local Saleor git checkout"
+    )
+    parser.add_argument("repo", type=Path, help="path to Saleor git repository")
+    parser.add_argument("refs", nargs="*", help="refs to backfill (all tags if empty)")
+    parser.add_argument("--schema-path", default=SCHEMA_PATH)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    data_store = DataStore(
+        remote_url=REMOTE_DATA_URL, local_path=DATA_DIR, cache_path=REMOTE_CACHE_DIR
+    )
+    history_store = HistoryStore(data_store)
+
+    refs = args.refs or get_git_tags(args.repo)
+    for ref, error in backfill_history(
+        history_store,
+        args.repo,
+        refs,
+        schema_path=args.schema_path,
+        max_workers=args.workers,
+        cache_path=PARSE_CACHE_DIR,
+    ):
+        print(f"{ref}: {error}" if error else ref)
+
+
+if __name__ == "__main__":
+    main()
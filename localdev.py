@@ -1,26 +1,32 @@
-from graphql import parse
-
-from main import BUILD_DIR
+from main import BUILD_DIR, FRAGMENTS_CACHE, PARSE_CACHE_DIR, TEMPLATES_CACHE_DIR
 from saleor_deprecations import (
+    SchemaGraph,
     diff_schemas,
     generate_report,
-    get_deprecated_types,
-    get_schema_json,
+    get_environment,
+    load_schema_data,
 )
 
 
 def main():
-    new_schema_ast = parse(open("./schema-new.graphql").read())
-    new_deprecated_types = get_deprecated_types(new_schema_ast)
-    new_schema = get_schema_json(new_schema_ast, new_deprecated_types)
+    new_deprecated_types, new_schema = load_schema_data(
+        open("./schema-new.graphql").read(), PARSE_CACHE_DIR
+    )
 
     # last_schema = schemas.load_last_entry()
-    old_schema_ast = parse(open("./schema-old.graphql").read())
-    old_deprecated_types = get_deprecated_types(old_schema_ast)
-    old_schema = get_schema_json(old_schema_ast, old_deprecated_types)
+    old_deprecated_types, old_schema = load_schema_data(
+        open("./schema-old.graphql").read(), PARSE_CACHE_DIR
+    )
 
-    print(diff_schemas(old_schema, new_schema))
-    generate_report(new_schema, new_deprecated_types, BUILD_DIR / "index.html")
+    print(diff_schemas(old_schema, new_schema, renames=True))
+    generate_report(
+        new_schema,
+        new_deprecated_types,
+        BUILD_DIR / "index.html",
+        graph=SchemaGraph(new_schema),
+        env=get_environment(TEMPLATES_CACHE_DIR),
+        fragments_path=FRAGMENTS_CACHE,
+    )
 
 
 if __name__ == "__main__":
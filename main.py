@@ -1,26 +1,44 @@
+import asyncio
 import os
+from datetime import date
+from functools import partial
 from os.path import abspath, dirname
 from pathlib import Path
 
-from graphql import parse
-
 from saleor_deprecations import (
     DataStore,
+    HistoryStore,
+    SchemaGraph,
+    attach_impact,
     diff_schemas,
     download_schema,
     generate_report,
-    get_deprecated_types,
-    get_schema_json,
+    generate_sharded_report,
+    get_builder_hash,
+    get_environment,
+    get_package_hash,
+    load_schema_data,
+    scan_deprecated_types,
 )
+from saleor_deprecations.source_hash import get_files_hash
 
 BUILD_DIR = Path(dirname(abspath(__file__))) / "build"
 DATA_DIR = BUILD_DIR / "data"
+CACHE_DIR = Path(dirname(abspath(__file__))) / ".cache"
+REMOTE_CACHE_DIR = CACHE_DIR / "remote"
+PARSE_CACHE_DIR = CACHE_DIR / "parsed"
+TEMPLATES_CACHE_DIR = CACHE_DIR / "templates"
+FRAGMENTS_CACHE = CACHE_DIR / "fragments.json"
 
 REMOTE_DATA_URL = os.environ.get("REMOTE_DATA_URL")
 REMOTE_SCHEMA_URL = os.environ.get("REMOTE_SCHEMA_URL")
+REMOTE_SCHEMA_MAX_SIZE = int(os.environ.get("REMOTE_SCHEMA_MAX_SIZE", 64 * 1024 * 1024))
+REPORT_SHARDED = bool(os.environ.get("REPORT_SHARDED"))
 
 PREVIOUS_SCHEMA = "schema-previous"
 CHANGES = "schema-changes"
+SCHEMA_VALIDATORS = "schema-validators"
+SNAPSHOT_CODEC = "gzip"
 
 
 def main():
@@ -32,20 +50,109 @@ def main():
     if not all((REMOTE_DATA_URL, REMOTE_SCHEMA_URL)):
         return
 
-    data_store = DataStore(remote_url=REMOTE_DATA_URL, local_path=DATA_DIR)
+    asyncio.run(run_pipeline())
+
+
+async def run_pipeline():
+    loop = asyncio.get_running_loop()
+    data_store = DataStore(
+        remote_url=REMOTE_DATA_URL, local_path=DATA_DIR, cache_path=REMOTE_CACHE_DIR
+    )
+
+    schema_validators = (
+        await loop.run_in_executor(None, data_store.get_remote, SCHEMA_VALIDATORS) or {}
+    )
+    # Report built by different code or templates must be rebuilt even if
+    # schema didn't change, so validators of other builds are not used
+    build_hash = get_build_hash()
+    builder_hash = get_builder_hash()
+    previous_digest = None
+    if schema_validators.get("build") != build_hash:
+        if schema_validators.get("builder") == builder_hash:
+            previous_digest = schema_validators.get("digest")
+        schema_validators = {"build": build_hash, "builder": builder_hash}
+
+    current_schema_sdl = await loop.run_in_executor(
+        None,
+        partial(
+            download_schema,
+            REMOTE_SCHEMA_URL,
+            schema_validators,
+            stream=True,
+            max_size=REMOTE_SCHEMA_MAX_SIZE,
+            session=data_store.session,
+            timeout=data_store.timeout,
+        ),
+    )
+    if current_schema_sdl is None:
+        # Schema didn't change, last artifacts are still up to date
+        data_store.set_local(SCHEMA_VALIDATORS, schema_validators)
+        return
+
+    # Previous snapshot doesn't depend on current schema, so it's fetched
+    # while current schema is parsed
+    previous_schema_future = loop.run_in_executor(
+        None, data_store.get_remote, PREVIOUS_SCHEMA
+    )
 
-    current_schema_ast = parse(download_schema(REMOTE_SCHEMA_URL))
-    deprecated_types = get_deprecated_types(current_schema_ast)
-    current_schema = get_schema_json(current_schema_ast, deprecated_types)
+    if schema_validators["digest"] == previous_digest:
+        # Only report needs rebuilding, schema JSON built from the same schema
+        # by the same builder is stored already, so deprecations are scanned
+        # without full parse
+        deprecated_types = await loop.run_in_executor(
+            None, scan_deprecated_types, current_schema_sdl
+        )
+        current_schema = await previous_schema_future
+        if current_schema:
+            data_store.set_local(SCHEMA_VALIDATORS, schema_validators)
+            render_report(current_schema, deprecated_types, SchemaGraph(current_schema))
+            return
 
-    previous_schema = data_store.get_remote(PREVIOUS_SCHEMA)
+    deprecated_types, current_schema = await loop.run_in_executor(
+        None, load_schema_data, current_schema_sdl, PARSE_CACHE_DIR
+    )
+
+    current_graph = SchemaGraph(current_schema)
+
+    previous_schema = await previous_schema_future
     if previous_schema:
-        diff = diff_schemas(previous_schema, current_schema)
+        diff = diff_schemas(previous_schema, current_schema, renames=True)
         if diff:
+            attach_impact(diff, SchemaGraph(previous_schema), current_graph)
             data_store.set_local(CHANGES, diff)
 
-    data_store.set_local(PREVIOUS_SCHEMA, current_schema)
-    generate_report(current_schema, deprecated_types, BUILD_DIR / "index.html")
+    data_store.set_local(PREVIOUS_SCHEMA, current_schema, SNAPSHOT_CODEC)
+    HistoryStore(data_store).add_snapshot(date.today().isoformat(), current_schema)
+    data_store.set_local(SCHEMA_VALIDATORS, schema_validators)
+    render_report(current_schema, deprecated_types, current_graph)
+
+
+def get_build_hash() -> str:
+    # Pipeline code and settings shape published artifacts too
+    return get_files_hash(
+        [Path(__file__)], get_package_hash(), REPORT_SHARDED, SNAPSHOT_CODEC
+    )
+
+
+def render_report(schema, deprecated_types, graph):
+    if REPORT_SHARDED:
+        generate_sharded_report(
+            schema,
+            deprecated_types,
+            BUILD_DIR,
+            graph=graph,
+            env=get_environment(TEMPLATES_CACHE_DIR),
+            fragments_path=FRAGMENTS_CACHE,
+        )
+    else:
+        generate_report(
+            schema,
+            deprecated_types,
+            BUILD_DIR / "index.html",
+            graph=graph,
+            env=get_environment(TEMPLATES_CACHE_DIR),
+            fragments_path=FRAGMENTS_CACHE,
+        )
 
 
 if __name__ == "__main__":
@@ -1,15 +1,54 @@
 from .data_store import DataStore
 from .deprecated_types import get_deprecated_types
-from .report_gen import generate_report
-from .schema_diff import diff_schemas
+from .deprecation_scanner import scan_deprecated_types
+from .deprecation_table import DeprecationTable
+from .diff_rules import BUILTIN_RULES, EXTRA_RULES, DiffRule
+from .fragment_cache import FragmentCache
+from .git_history import backfill_history
+from .history_store import HistoryStore
+from .parse_cache import get_builder_hash, load_schema_data
+from .report_gen import (
+    compile_templates,
+    generate_report,
+    generate_sharded_report,
+    get_environment,
+)
+from .schema_builder import build_schema_data, build_schema_model
+from .schema_diff import diff_schemas, iter_diff
 from .schema_download import download_schema
+from .schema_graph import SchemaGraph, attach_impact
 from .schema_json import get_schema_json
+from .schema_model import SchemaModel, StringTable
+from .schema_timeline import SchemaTimeline
+from .source_hash import get_package_hash
 
 __all__ = [
+    "BUILTIN_RULES",
+    "EXTRA_RULES",
     "DataStore",
+    "DeprecationTable",
+    "DiffRule",
+    "FragmentCache",
+    "HistoryStore",
+    "SchemaGraph",
+    "SchemaModel",
+    "SchemaTimeline",
+    "StringTable",
+    "attach_impact",
+    "backfill_history",
+    "build_schema_data",
+    "build_schema_model",
+    "compile_templates",
     "diff_schemas",
     "download_schema",
     "generate_report",
+    "generate_sharded_report",
+    "get_builder_hash",
     "get_deprecated_types",
+    "get_environment",
+    "get_package_hash",
     "get_schema_json",
+    "iter_diff",
+    "load_schema_data",
+    "scan_deprecated_types",
 ]
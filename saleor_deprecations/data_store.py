@@ -1,22 +1,99 @@
-import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import requests
 
+from .disk_cache import DEFAULT_MAX_SIZE, DiskCache
+from .http_session import (
+    DEFAULT_POOL_SIZE,
+    DEFAULT_TIMEOUT,
+    create_session,
+    get_conditional_headers,
+    get_validators,
+)
+from .snapshot_codec import (
+    DEFAULT_CODEC,
+    SNAPSHOT_EXTENSION,
+    decode_snapshot,
+    encode_snapshot,
+    get_codec,
+)
+
 
 class DataStore:
-    def __init__(self, remote_url: str, local_path: Path):
-        self.remote_url = remote_url.rstrip("/")
+    def __init__(
+        self,
+        remote_url: str | None,
+        local_path: Path,
+        session: requests.Session | None = None,
+        timeout: float | tuple[float, float] = DEFAULT_TIMEOUT,
+        max_workers: int = DEFAULT_POOL_SIZE,
+        cache_path: Path | None = None,
+        cache_max_size: int = DEFAULT_MAX_SIZE,
+        offline: bool = False,
+        codec: str = DEFAULT_CODEC,
+    ):
+        self.remote_url = remote_url.rstrip("/") if remote_url else None
         self.local_path = local_path
+        self.session = session or create_session(pool_size=max_workers)
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.cache = DiskCache(cache_path, cache_max_size) if cache_path else None
+        self.offline = offline
+        self.codec = get_codec(codec)
 
     def get_remote(self, key: str):
-        r = requests.get(f"{self.remote_url}/{key}.json")
+        content = self.fetch_remote(f"{key}{SNAPSHOT_EXTENSION}")
+        if content is None:
+            return None
+        return decode_snapshot(content)
+
+    def get_local(self, key: str):
+        file_path = self.local_path / f"{key}{SNAPSHOT_EXTENSION}"
+        if not file_path.is_file():
+            return None
+        return decode_snapshot(file_path.read_bytes())
+
+    def get(self, key: str):
+        data = self.get_local(key)
+        if data is None:
+            return self.get_remote(key)
+        return data
+
+    def get_many(self, keys: list[str], local_first: bool = False) -> dict:
+        if not keys:
+            return {}
+
+        get = self.get if local_first else self.get_remote
+        workers = min(len(keys), self.max_workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(zip(keys, executor.map(get, keys)))
+
+    def fetch_remote(self, file_name: str) -> bytes | None:
+        cached = self.cache.get(file_name) if self.cache else None
+        if self.offline or not self.remote_url:
+            return cached[0] if cached else None
+
+        r = self.session.get(
+            f"{self.remote_url}/{file_name}",
+            headers=get_conditional_headers(cached[1] if cached else None),
+            timeout=self.timeout,
+        )
+        if r.status_code == 304 and cached:
+            return cached[0]
         if r.status_code == 404:
+            if self.cache:
+                self.cache.delete(file_name)
             return None
 
         r.raise_for_status()
-        return r.json()
+        if self.cache:
+            self.cache.set(file_name, r.content, get_validators(r))
+        return r.content
 
-    def set_local(self, key: str, data: dict | list):
-        with open(self.local_path / f"{key}.json", "w+") as fp:
-            json.dump(data, fp, indent=2)
+    def set_local(self, key: str, data: dict | list, codec: str | None = None):
+        snapshot_codec = get_codec(codec) if codec else self.codec
+        file_path = self.local_path / f"{key}{SNAPSHOT_EXTENSION}"
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(file_path, "wb+") as fp:
+            fp.write(encode_snapshot(data, snapshot_codec))
@@ -0,0 +1,316 @@
+import re
+
+from graphql.language.block_string import dedent_block_string_lines
+
+from .deprecated_types import (
+    REMOVED_MESSAGE,
+    DeprecatedEnumType,
+    DeprecatedEnumValueType,
+    DeprecatedInputType,
+    DeprecatedInputFieldType,
+    DeprecatedNode,
+    DeprecatedObjectType,
+    DeprecatedObjectFieldType,
+    DeprecatedObjectFieldArgumentType,
+    DeprecatedScalarType,
+    DeprecatedUnionType,
+    parse_deprecated_message,
+)
+
+# Whitespace, commas and comments are matched without capture group so
+# findall() returns empty strings for them
+TOKEN_RE = re.compile(
+    r"[\s,\ufeff]+"
+    r"|#[^\n\r]*"
+    r'|("""(?:\\"""|[\s\S])*?"""'
+    r'|"(?:[^"\\\n\r]|\\.)*"'
+    r"|\.\.\."
+    r"|[_A-Za-z][_0-9A-Za-z]*"
+    r"|-?[0-9]+(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?"
+    r"|[!$&()\[\]{}:=@|])"
+)
+LINE_BREAK_RE = re.compile(r"\r\n|[\n\r]")
+ESCAPE_RE = re.compile(r'\\(u\{[0-9A-Fa-f]+\}|u[0-9A-Fa-f]{4}|["\\/bfnrt])')
+ESCAPED_CHARACTERS = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+
+
+def scan_deprecated_types(schema_sdl: str) -> list[DeprecatedNode]:
+    scanner = DeprecationScanner(schema_sdl)
+    scanner.scan()
+    return scanner.deprecated_types
+
+
+class DeprecationScanner:
+    def __init__(self, schema_sdl: str):
+        self.tokens = [t for t in TOKEN_RE.findall(schema_sdl) if t]
+        self.pos = 0
+        self.deprecated_types: list[DeprecatedNode] = []
+
+    def scan(self):
+        tokens = self.tokens
+        while self.pos < len(tokens):
+            description = self.read_description()
+            keyword = self.next()
+            if keyword in ("type", "interface"):
+                self.scan_object_type(description, keyword == "interface")
+            elif keyword == "input":
+                self.scan_input_type(description)
+            elif keyword == "enum":
+                self.scan_enum_type(description)
+            elif keyword == "scalar":
+                self.scan_scalar_type(description)
+            elif keyword == "union":
+                self.scan_union_type(description)
+            elif keyword == "schema":
+                self.read_directives()
+                self.skip_block("{", "}")
+            elif keyword == "directive":
+                self.skip_directive_definition()
+            else:
+                raise ValueError(f"Unknown definition: {keyword}")
+
+    def scan_object_type(self, description: str | None, interface: bool):
+        name = self.next()
+        if self.peek() == "implements":
+            self.next()
+            if self.peek() == "&":
+                self.next()
+            self.next()
+            while self.peek() == "&":
+                self.pos += 2
+
+        if deprecated := self.get_deprecated_status(description):
+            self.deprecated_types.append(
+                DeprecatedObjectType(*deprecated, interface=interface, object=name)
+            )
+
+        if self.peek() != "{":
+            return
+
+        self.next()
+        while self.peek() != "}":
+            field_description = self.read_description()
+            field = self.next()
+            arguments = []
+            if self.peek() == "(":
+                self.next()
+                while self.peek() != ")":
+                    arg_description = self.read_description()
+                    argument = self.next()
+                    self.skip_input_value()
+                    if deprecated := self.get_deprecated_status(arg_description):
+                        arguments.append(
+                            DeprecatedObjectFieldArgumentType(
+                                *deprecated,
+                                interface=interface,
+                                object=name,
+                                field=field,
+                                argument=argument,
+                            )
+                        )
+                self.next()
+
+            self.next()  # ":"
+            self.skip_type()
+            if deprecated := self.get_deprecated_status(field_description):
+                self.deprecated_types.append(
+                    DeprecatedObjectFieldType(
+                        *deprecated, interface=interface, object=name, field=field
+                    )
+                )
+            # Field arguments are listed after the field itself
+            self.deprecated_types.extend(arguments)
+        self.next()
+
+    def scan_input_type(self, description: str | None):
+        name = self.next()
+        if deprecated := self.get_deprecated_status(description):
+            self.deprecated_types.append(DeprecatedInputType(*deprecated, input=name))
+
+        if self.peek() != "{":
+            return
+
+        self.next()
+        while self.peek() != "}":
+            field_description = self.read_description()
+            field = self.next()
+            self.skip_input_value()
+            if deprecated := self.get_deprecated_status(field_description):
+                self.deprecated_types.append(
+                    DeprecatedInputFieldType(*deprecated, input=name, field=field)
+                )
+        self.next()
+
+    def scan_enum_type(self, description: str | None):
+        name = self.next()
+        if deprecated := self.get_deprecated_status(description):
+            self.deprecated_types.append(DeprecatedEnumType(*deprecated, enum=name))
+
+        if self.peek() != "{":
+            return
+
+        self.next()
+        while self.peek() != "}":
+            value_description = self.read_description()
+            value = self.next()
+            if deprecated := self.get_deprecated_status(value_description):
+                self.deprecated_types.append(
+                    DeprecatedEnumValueType(*deprecated, enum=name, value=value)
+                )
+        self.next()
+
+    def scan_scalar_type(self, description: str | None):
+        name = self.next()
+        if deprecated := self.get_deprecated_status(description):
+            self.deprecated_types.append(DeprecatedScalarType(*deprecated, scalar=name))
+
+    def scan_union_type(self, description: str | None):
+        name = self.next()
+        deprecated = self.get_deprecated_status(description)
+        if self.peek() == "=":
+            self.next()
+            if self.peek() == "|":
+                self.next()
+            self.next()
+            while self.peek() == "|":
+                self.pos += 2
+
+        if deprecated:
+            self.deprecated_types.append(DeprecatedUnionType(*deprecated, union=name))
+
+    def get_deprecated_status(self, description: str | None):
+        # Directives follow the description, so they are always read here
+        reason = self.read_directives()
+
+        if description and (version := parse_deprecated_message(description)):
+            return version, description.strip()
+        if reason is not None:
+            return parse_deprecated_message(reason), reason.strip()
+        return None
+
+    def read_description(self) -> str | None:
+        token = self.peek()
+        if not token or token[0] != '"':
+            return None
+
+        self.next()
+        # Cheap check to skip decoding descriptions that can't be deprecations
+        if "\\" not in token and REMOVED_MESSAGE not in token.lower():
+            return ""
+        return decode_string(token)
+
+    def read_directives(self) -> str | None:
+        reason = None
+        while self.peek() == "@":
+            self.next()
+            directive = self.next()
+            if self.peek() != "(":
+                continue
+
+            self.next()
+            while self.peek() != ")":
+                argument = self.next()
+                self.next()  # ":"
+                value = self.peek()
+                if (
+                    reason is None
+                    and directive == "deprecated"
+                    and argument == "reason"
+                    and value[0] == '"'
+                ):
+                    reason = decode_string(value)
+                self.skip_value()
+            self.next()
+
+        return reason
+
+    def skip_input_value(self):
+        self.next()  # ":"
+        self.skip_type()
+        if self.peek() == "=":
+            self.next()
+            self.skip_value()
+
+    def skip_type(self):
+        if self.next() == "[":
+            self.skip_type()
+            self.next()  # "]"
+        if self.peek() == "!":
+            self.next()
+
+    def skip_value(self):
+        token = self.next()
+        if token == "[":
+            self.pos -= 1
+            self.skip_block("[", "]")
+        elif token == "{":
+            self.pos -= 1
+            self.skip_block("{", "}")
+        elif token == "$":
+            self.next()
+
+    def skip_block(self, start: str, end: str):
+        if self.peek() != start:
+            return
+
+        depth = 0
+        while True:
+            token = self.next()
+            if token == start:
+                depth += 1
+            elif token == end:
+                depth -= 1
+                if not depth:
+                    return
+
+    def skip_directive_definition(self):
+        self.next()  # "@"
+        self.next()
+        if self.peek() == "(":
+            self.skip_block("(", ")")
+        if self.peek() == "repeatable":
+            self.next()
+        self.next()  # "on"
+        if self.peek() == "|":
+            self.next()
+        self.next()
+        while self.peek() == "|":
+            self.pos += 2
+
+    def peek(self) -> str | None:
+        if self.pos < len(self.tokens):
+            return self.tokens[self.pos]
+        return None
+
+    def next(self) -> str:
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+
+def decode_string(token: str) -> str:
+    if token.startswith('"""'):
+        lines = LINE_BREAK_RE.split(token[3:-3].replace('\\"""', '"""'))
+        return "\n".join(dedent_block_string_lines(lines))
+
+    return (
+        ESCAPE_RE.sub(decode_escape, token[1:-1])
+        .encode("utf-16", "surrogatepass")
+        .decode("utf-16")
+    )
+
+
+def decode_escape(match: re.Match) -> str:
+    escape = match.group(1)
+    if escape[0] != "u":
+        return ESCAPED_CHARACTERS[escape]
+    return chr(int(escape.strip("u{}"), 16))
@@ -0,0 +1,155 @@
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator
+
+from .deprecated_types import (
+    VERSION_RE,
+    DeprecatedEnumType,
+    DeprecatedEnumValueType,
+    DeprecatedInputType,
+    DeprecatedInputFieldType,
+    DeprecatedNode,
+    DeprecatedObjectType,
+    DeprecatedObjectFieldType,
+    DeprecatedObjectFieldArgumentType,
+    DeprecatedScalarType,
+    DeprecatedUnionType,
+)
+
+# Names of attributes holding owning type, member and argument for each kind
+KIND_ATTRIBUTES: dict[type[DeprecatedNode], tuple[str, ...]] = {
+    DeprecatedObjectType: ("object",),
+    DeprecatedObjectFieldType: ("object", "field"),
+    DeprecatedObjectFieldArgumentType: ("object", "field", "argument"),
+    DeprecatedInputType: ("input",),
+    DeprecatedInputFieldType: ("input", "field"),
+    DeprecatedEnumType: ("enum",),
+    DeprecatedEnumValueType: ("enum", "value"),
+    DeprecatedScalarType: ("scalar",),
+    DeprecatedUnionType: ("union",),
+}
+KINDS = tuple(KIND_ATTRIBUTES)
+KINDS_WITH_INTERFACE = (
+    DeprecatedObjectType,
+    DeprecatedObjectFieldType,
+    DeprecatedObjectFieldArgumentType,
+)
+
+UNKNOWN_VERSION = (sys.maxsize,)
+
+
+def parse_version(version: str | None) -> tuple[int, ...]:
+    if not version or not VERSION_RE.match(version):
+        return UNKNOWN_VERSION
+    return tuple(int(part) for part in VERSION_RE.match(version)[0].split("."))
+
+
+class DeprecationTable:
+    __slots__ = (
+        "kinds",
+        "versions",
+        "version_keys",
+        "messages",
+        "owners",
+        "members",
+        "arguments",
+        "interfaces",
+        "by_version",
+        "by_owner",
+        "by_kind",
+        "interface_rows",
+        "sorted_rows",
+    )
+
+    def __init__(self, deprecated_types: Iterable[DeprecatedNode] = ()):
+        self.kinds = array("B")
+        self.versions: list[str | None] = []
+        self.version_keys: list[tuple[int, ...]] = []
+        self.messages: list[str] = []
+        self.owners: list[str] = []
+        self.members: list[str | None] = []
+        self.arguments: list[str | None] = []
+        self.interfaces = array("B")
+
+        self.by_version: dict[str | None, list[int]] = {}
+        self.by_owner: dict[str, list[int]] = {}
+        self.by_kind: dict[type[DeprecatedNode], list[int]] = {}
+        self.interface_rows: list[int] = []
+        self.sorted_rows: list[int] | None = None
+
+        for deprecated_type in deprecated_types:
+            self.append(deprecated_type)
+
+    def append(self, deprecated_type: DeprecatedNode):
+        kind = type(deprecated_type)
+        names = [sys.intern(getattr(deprecated_type, a)) for a in KIND_ATTRIBUTES[kind]]
+        names += [None] * (3 - len(names))
+        interface = kind in KINDS_WITH_INTERFACE and deprecated_type.interface
+        version = deprecated_type.version and sys.intern(deprecated_type.version)
+
+        row = len(self.kinds)
+        self.kinds.append(KINDS.index(kind))
+        self.versions.append(version)
+        self.version_keys.append(parse_version(version))
+        self.messages.append(deprecated_type.message)
+        self.owners.append(names[0])
+        self.members.append(names[1])
+        self.arguments.append(names[2])
+        self.interfaces.append(interface)
+
+        self.by_version.setdefault(version, []).append(row)
+        self.by_owner.setdefault(names[0], []).append(row)
+        self.by_kind.setdefault(kind, []).append(row)
+        if interface:
+            self.interface_rows.append(row)
+        self.sorted_rows = None
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def __iter__(self) -> Iterator[DeprecatedNode]:
+        return (self[row] for row in range(len(self)))
+
+    def __getitem__(self, row: int) -> DeprecatedNode:
+        kind = KINDS[self.kinds[row]]
+        names = (self.owners[row], self.members[row], self.arguments[row])
+        kwargs = dict(zip(KIND_ATTRIBUTES[kind], names))
+        if kind in KINDS_WITH_INTERFACE:
+            kwargs["interface"] = bool(self.interfaces[row])
+        return kind(version=self.versions[row], message=self.messages[row], **kwargs)
+
+    def get_versions(self) -> list[str | None]:
+        return sorted(self.by_version, key=parse_version)
+
+    def removed_in(self, version: str | None) -> list[DeprecatedNode]:
+        return [self[row] for row in self.by_version.get(version, [])]
+
+    def removed_between(
+        self, min_version: str | None = None, max_version: str | None = None
+    ) -> list[DeprecatedNode]:
+        rows = self.get_sorted_rows()
+        key = self.version_keys.__getitem__
+        start = 0
+        end = len(rows)
+        if min_version:
+            start = bisect_left(rows, parse_version(min_version), key=key)
+        if max_version:
+            end = bisect_right(rows, parse_version(max_version), key=key)
+        return [self[row] for row in rows[start:end]]
+
+    def for_type(self, type_name: str) -> list[DeprecatedNode]:
+        return [self[row] for row in self.by_owner.get(type_name, [])]
+
+    def of_kind(self, kind: type[DeprecatedNode]) -> list[DeprecatedNode]:
+        return [self[row] for row in self.by_kind.get(kind, [])]
+
+    def on_interfaces(self) -> list[DeprecatedNode]:
+        return [self[row] for row in self.interface_rows]
+
+    def get_sorted_rows(self) -> list[int]:
+        if self.sorted_rows is None:
+            self.sorted_rows = sorted(
+                range(len(self)), key=self.version_keys.__getitem__
+            )
+        return self.sorted_rows
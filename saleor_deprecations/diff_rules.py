@@ -0,0 +1,173 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import ne
+from typing import Any, Callable, Iterable
+
+NEW = "new"
+DELETED = "deleted"
+CHANGED = "changed"
+CHANGES = (NEW, DELETED, CHANGED)
+
+# Member collections reachable in each kind of type, "" is the type itself
+SCHEMA_PATHS = {
+    "object": ("", "fields", "fields.arguments"),
+    "interface": ("", "fields", "fields.arguments"),
+    "input": ("", "fields"),
+    "enum": ("", "values"),
+    "union": ("", "types"),
+    "scalar": ("",),
+}
+RECORD_KEYS = {
+    "": ("type",),
+    "fields": ("type", "field"),
+    "fields.arguments": ("type", "field", "argument"),
+    "values": ("enum", "value"),
+    "types": ("union", "type"),
+}
+
+
+@dataclass(frozen=True)
+class DiffRule:
+    kind: str
+    path: str = ""
+    change: str = CHANGED
+    type_kinds: tuple[str, ...] | None = None
+    attribute: str | None = None
+    predicate: Callable[[Any, Any], bool] | None = None
+    values: Callable[[Any, Any], dict] | None = None
+
+    def get_record(self, names: tuple[str, ...], values: dict | None = None) -> dict:
+        record = {"diff": self.kind, **dict(zip(RECORD_KEYS[self.path], names))}
+        if values:
+            record.update(values)
+        return record
+
+    def compare(self, old_data, current_data) -> dict | None:
+        if self.attribute:
+            old_data = old_data.get(self.attribute)
+            current_data = current_data.get(self.attribute)
+        if not (self.predicate or ne)(old_data, current_data):
+            return None
+        return (self.values or get_change_values)(old_data, current_data)
+
+
+class DiffTable:
+    def __init__(self, rules: Iterable[DiffRule]):
+        self.rules: dict[tuple[str, str, str], list[DiffRule]] = {}
+        self.children: dict[tuple[str, str], list[str]] = {}
+
+        for rule in rules:
+            if rule.path not in RECORD_KEYS:
+                raise ValueError(f"Unknown diff rule path: {rule.path}")
+            if rule.change not in CHANGES:
+                raise ValueError(f"Unknown diff rule change: {rule.change}")
+
+            type_kinds = rule.type_kinds
+            if type_kinds is None:
+                type_kinds = [
+                    k for k, paths in SCHEMA_PATHS.items() if rule.path in paths
+                ]
+            for type_kind in type_kinds:
+                if rule.path not in SCHEMA_PATHS.get(type_kind, ()):
+                    raise ValueError(f"{type_kind} types have no {rule.path or 'type'}")
+                self.rules.setdefault((type_kind, rule.path, rule.change), []).append(
+                    rule
+                )
+                self.add_path(type_kind, rule.path)
+
+        # Rules for each member collection are resolved once, not per member
+        self.collections: dict[tuple[str, str], list[tuple]] = {}
+        for (type_kind, path), collections in self.children.items():
+            self.collections[(type_kind, path)] = [
+                self.get_collection(type_kind, path, collection)
+                for collection in collections
+            ]
+
+    def add_path(self, type_kind: str, path: str):
+        # Collections are only traversed when some rule is declared inside them
+        while path:
+            parent, _, collection = path.rpartition(".")
+            children = self.children.setdefault((type_kind, parent), [])
+            if collection in children:
+                return
+            children.append(collection)
+            path = parent
+
+    def get_collection(self, type_kind: str, path: str, collection: str) -> tuple:
+        members_path = f"{path}.{collection}" if path else collection
+        return (
+            collection,
+            members_path,
+            self.get(type_kind, members_path, NEW),
+            self.get(type_kind, members_path, CHANGED),
+            self.get(type_kind, members_path, DELETED),
+            self.children.get((type_kind, members_path), []),
+        )
+
+    def get(self, type_kind: str, path: str, change: str) -> list[DiffRule]:
+        return self.rules.get((type_kind, path, change), [])
+
+    def has_rules(self, path: str, change: str) -> bool:
+        return any(key[1:] == (path, change) for key in self.rules)
+
+
+@lru_cache(maxsize=32)
+def compile_rules(rules: tuple[DiffRule, ...]) -> DiffTable:
+    return DiffTable(rules)
+
+
+def is_newly_deprecated(old_value, current_value) -> bool:
+    return bool(current_value) and current_value != old_value
+
+
+def get_deprecated_version(old_value, current_value) -> dict:
+    return {"version": current_value}
+
+
+def get_change_values(old_value, current_value) -> dict:
+    return {"old": old_value, "new": current_value}
+
+
+def deprecated_rule(kind: str, path: str = "") -> DiffRule:
+    return DiffRule(
+        kind,
+        path,
+        attribute="deprecated",
+        predicate=is_newly_deprecated,
+        values=get_deprecated_version,
+    )
+
+
+BUILTIN_RULES = (
+    # Types
+    DiffRule("type_new", change=NEW),
+    DiffRule("type_deleted", change=DELETED),
+    deprecated_rule("type_deprecated"),
+    # Objects/Interfaces/Inputs
+    DiffRule("field_new", "fields", NEW),
+    DiffRule("field_deleted", "fields", DELETED),
+    deprecated_rule("field_deprecated", "fields"),
+    # Objects/Interfaces
+    DiffRule("argument_new", "fields.arguments", NEW),
+    DiffRule("argument_deleted", "fields.arguments", DELETED),
+    deprecated_rule("argument_deprecated", "fields.arguments"),
+    # Enums
+    DiffRule("enum_value_new", "values", NEW),
+    DiffRule("enum_value_deleted", "values", DELETED),
+    deprecated_rule("enum_value_deprecated", "values"),
+    # Unions
+    DiffRule("union_type_new", "types", NEW),
+    DiffRule("union_type_deleted", "types", DELETED),
+)
+
+EXTRA_RULES = (
+    DiffRule("type_description_changed", attribute="description"),
+    DiffRule("field_description_changed", "fields", attribute="description"),
+    DiffRule("field_type_changed", "fields", attribute="type"),
+    DiffRule(
+        "field_default_changed", "fields", type_kinds=("input",), attribute="default"
+    ),
+    DiffRule("argument_type_changed", "fields.arguments", attribute="type"),
+    DiffRule("argument_default_changed", "fields.arguments", attribute="default"),
+    DiffRule("enum_value_description_changed", "values", attribute="description"),
+)
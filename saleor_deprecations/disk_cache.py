@@ -0,0 +1,113 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+# Eviction frees some room below the budget, so it doesn't run on every write
+EVICT_TARGET = 0.8
+
+DATA_SUFFIX = ".data"
+META_SUFFIX = ".meta.json"
+
+
+class DiskCache:
+    def __init__(self, path: Path, max_size: int = DEFAULT_MAX_SIZE):
+        self.path = path
+        self.max_size = max_size
+        # Total size of cached data, read from disk on first write
+        self.size: int | None = None
+        self.lock = threading.Lock()
+
+    def get(self, key: str) -> tuple[bytes, dict] | None:
+        data_path, meta_path = self.get_paths(key)
+        try:
+            content = data_path.read_bytes()
+            meta = json.loads(meta_path.read_text())
+        except (OSError, ValueError):
+            return None
+
+        self.touch(key)
+        return content, meta
+
+    def set(self, key: str, content: bytes, meta: dict):
+        self.path.mkdir(parents=True, exist_ok=True)
+        data_path, meta_path = self.get_paths(key)
+        old_size = get_file_size(data_path)
+
+        # Stale metadata must not validate new data, so it's removed first
+        meta_path.unlink(missing_ok=True)
+        self.write_file(data_path, content)
+        self.write_file(meta_path, json.dumps({**meta, "key": key}).encode())
+
+        with self.lock:
+            if self.size is None:
+                self.size = self.get_total_size()
+            else:
+                self.size += len(content) - old_size
+            # Directory is only scanned when cache grows over its budget
+            if self.size > self.max_size:
+                self.evict()
+
+    def delete(self, key: str):
+        data_path, meta_path = self.get_paths(key)
+        size = get_file_size(data_path)
+        data_path.unlink(missing_ok=True)
+        meta_path.unlink(missing_ok=True)
+
+        with self.lock:
+            if self.size is not None:
+                self.size -= size
+
+    def touch(self, key: str):
+        data_path, _ = self.get_paths(key)
+        try:
+            os.utime(data_path)
+        except OSError:
+            pass
+
+    def evict(self):
+        entries = list(self.iter_entries())
+        total_size = sum(size for _, size, _ in entries)
+        target_size = self.max_size * EVICT_TARGET
+        # Least recently used entries are removed first
+        for _, size, data_path in sorted(entries):
+            if total_size <= target_size:
+                break
+
+            data_path.unlink(missing_ok=True)
+            data_path.with_suffix(META_SUFFIX).unlink(missing_ok=True)
+            total_size -= size
+
+        self.size = total_size
+
+    def get_total_size(self) -> int:
+        return sum(size for _, size, _ in self.iter_entries())
+
+    def iter_entries(self):
+        for data_path in self.path.glob(f"*{DATA_SUFFIX}"):
+            try:
+                stat = data_path.stat()
+            except OSError:
+                continue
+            yield stat.st_mtime, stat.st_size, data_path
+
+    def write_file(self, path: Path, content: bytes):
+        # Readers never see partially written files
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        with os.fdopen(fd, "wb") as fp:
+            fp.write(content)
+        os.replace(tmp_path, path)
+
+    def get_paths(self, key: str) -> tuple[Path, Path]:
+        name = hashlib.sha256(key.encode()).hexdigest()
+        return self.path / f"{name}{DATA_SUFFIX}", self.path / f"{name}{META_SUFFIX}"
+
+
+def get_file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
@@ -43,3 +43,10 @@ class SchemaDownloadContentTypeError(SchemaDownloadError):
 
 class SchemaDownloadEmptyError(SchemaDownloadError):
     msg = "Server returned empty response"
+
+
+class SchemaDownloadTooLargeError(SchemaDownloadError):
+    msg: str
+
+    def __init__(self, max_size: int):
+        self.msg = f"Server returned response larger than {max_size} bytes"
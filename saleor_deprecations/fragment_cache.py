@@ -0,0 +1,62 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import jinja2
+from markupsafe import Markup
+
+from .source_hash import PACKAGE_DIR, get_files_hash
+
+FRAGMENT_TEMPLATE = "deprecation.html"
+# Filters and globals used by templates are registered there
+FILTERS_SOURCE = PACKAGE_DIR / "report_gen.py"
+CACHE_FORMAT = 2
+
+
+class FragmentCache:
+    def __init__(self, env: jinja2.Environment, file_path: Path, templates_dir: Path):
+        self.env = env
+        self.file_path = Path(file_path)
+        self.templates_dir = templates_dir
+        self.fragments = self.load()
+        # Only fragments used by the last report are saved, the rest is stale
+        self.used_fragments: dict[str, str] = {}
+        # Any template can be included by fragments, so all of them are hashed
+        self.salt = get_files_hash(
+            [*Path(templates_dir).glob("*.html"), FILTERS_SOURCE],
+            jinja2.__version__,
+            CACHE_FORMAT,
+        ).encode()
+
+    def render(self, type_data: dict) -> Markup:
+        key = self.get_key(type_data)
+        fragment = self.used_fragments.get(key) or self.fragments.get(key)
+        if fragment is None:
+            template = self.env.get_template(FRAGMENT_TEMPLATE)
+            fragment = template.render(type=type_data)
+        self.used_fragments[key] = fragment
+        return Markup(fragment)
+
+    def get_key(self, type_data: dict) -> str:
+        key = hashlib.blake2b(self.salt, digest_size=16)
+        key.update(json.dumps(type_data, sort_keys=True, default=str).encode())
+        return key.hexdigest()
+
+    def load(self) -> dict[str, str]:
+        try:
+            with open(self.file_path, encoding="utf-8") as fp:
+                return json.load(fp)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        # Written to temporary file first so concurrent runs never see partial data
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.file_path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as fp:
+            json.dump(
+                self.used_fragments, fp, ensure_ascii=False, separators=(",", ":")
+            )
+        os.replace(tmp_path, self.file_path)
@@ -0,0 +1,160 @@
+import os
+import re
+import subprocess
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from .history_store import HistoryStore
+from .parse_cache import load_schema_data
+
+SCHEMA_PATH = "saleor/graphql/schema.graphql"
+COMMITTER_RE = re.compile(rb"^committer .* ([0-9]+) [+-][0-9]{4}$", re.MULTILINE)
+
+
+def get_git_tags(repo_path: Path) -> list[str]:
+    result = subprocess.run(
+        [
+            "git",
+            "for-each-ref",
+            "--sort=creatordate",
+            "--format=%(refname:short)",
+            "refs/tags",
+        ],
+        cwd=repo_path,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.split()
+
+
+def get_commit_dates(
+    repo_path: Path, refs: Iterable[str]
+) -> dict[str, datetime | None]:
+    refs = list(refs)
+    dates = {}
+    commits = iter_git_objects(repo_path, [f"{ref}^{{commit}}" for ref in refs])
+    for ref, (_, content) in zip(refs, commits):
+        match = COMMITTER_RE.search(content) if content else None
+        dates[ref] = (
+            datetime.fromtimestamp(int(match[1]), timezone.utc) if match else None
+        )
+    return dates
+
+
+def iter_git_blobs(
+    repo_path: Path, refs: Iterable[str], path: str
+) -> Iterator[tuple[str, str | None, bytes | None]]:
+    refs = list(refs)
+    blobs = iter_git_objects(repo_path, [f"{ref}:{path}" for ref in refs])
+    for ref, (blob_id, content) in zip(refs, blobs):
+        yield ref, blob_id, content
+
+
+def iter_git_objects(
+    repo_path: Path, names: list[str]
+) -> Iterator[tuple[str | None, bytes | None]]:
+    process = subprocess.Popen(
+        ["git", "cat-file", "--batch"],
+        cwd=repo_path,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+    )
+
+    # Requests are written from separate thread so git never blocks on full
+    # stdout pipe while we are still writing to its stdin
+    def write_requests():
+        try:
+            for name in names:
+                process.stdin.write(f"{name}\n".encode())
+            process.stdin.close()
+        except BrokenPipeError:
+            pass  # Reading was stopped early
+
+    writer = threading.Thread(target=write_requests, daemon=True)
+    writer.start()
+
+    try:
+        for _ in names:
+            header = process.stdout.readline().decode().split()
+            if len(header) != 3:
+                yield None, None  # Object is missing, e.g. path at some ref
+                continue
+
+            object_id, _, size = header
+            content = process.stdout.read(int(size))
+            process.stdout.read(1)  # Trailing newline
+            yield object_id, content
+    finally:
+        process.stdout.close()
+        process.wait()
+        writer.join()
+
+
+def backfill_history(
+    history_store: HistoryStore,
+    repo_path: Path,
+    refs: Iterable[str],
+    schema_path: str = SCHEMA_PATH,
+    max_workers: int | None = None,
+    cache_path: Path | None = None,
+) -> Iterator[tuple[str, Exception | None]]:
+    max_workers = max_workers or os.cpu_count() or 1
+    load_schema = partial(load_schema_blob, cache_path=cache_path)
+    refs = list(refs)
+    # Snapshots are placed in history by commit date, not by backfill order
+    dates = get_commit_dates(repo_path, refs)
+
+    # Limits number of schemas held in memory while waiting for workers
+    pending: deque[tuple[str, Future | None]] = deque()
+    last_blob: tuple[str | None, Future | None] = (None, None)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for ref, blob_id, content in iter_git_blobs(repo_path, refs, schema_path):
+            if blob_id is None:
+                pending.append((ref, None))
+            elif blob_id == last_blob[0]:
+                # Schema didn't change between refs, reuse previous result
+                pending.append((ref, last_blob[1]))
+            else:
+                future = executor.submit(load_schema, content)
+                last_blob = (blob_id, future)
+                pending.append((ref, future))
+
+            while len(pending) > max_workers * 2:
+                yield add_history_snapshot(history_store, dates, *pending.popleft())
+
+        while pending:
+            yield add_history_snapshot(history_store, dates, *pending.popleft())
+
+
+def load_schema_blob(content: bytes, cache_path: Path | None) -> dict:
+    try:
+        _, schema_json = load_schema_data(content.decode(), cache_path)
+    except Exception as e:
+        # Errors raised by graphql-core can't always be pickled
+        raise ValueError(f"{type(e).__name__}: {e}") from None
+    return schema_json
+
+
+def add_history_snapshot(
+    history_store: HistoryStore,
+    dates: dict[str, datetime | None],
+    ref: str,
+    future: Future | None,
+) -> tuple[str, Exception | None]:
+    if future is None:
+        return ref, FileNotFoundError(f"Schema is missing at {ref}")
+
+    try:
+        schema_json = future.result()
+    except ValueError as e:
+        return ref, e
+
+    history_store.add_snapshot(ref, schema_json, dates[ref])
+    return ref, None
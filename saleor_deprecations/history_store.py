@@ -0,0 +1,132 @@
+import hashlib
+import json
+from bisect import bisect_right
+from datetime import datetime, timezone
+
+from .data_store import DataStore
+from .schema_model import SchemaModel, StringTable, TypeRecord
+
+HISTORY_PREFIX = "history"
+HISTORY_INDEX = f"{HISTORY_PREFIX}/index"
+
+
+class HistoryStore:
+    def __init__(self, data_store: DataStore):
+        self.data_store = data_store
+        # Loaded blobs share strings, so many snapshots can be held in memory
+        self.strings = StringTable()
+        self.blobs: dict[str, TypeRecord] = {}
+        self.manifests: dict[str, dict] = {}
+
+    def get_index(self) -> list[str]:
+        return [entry["id"] for entry in self.get_index_entries()]
+
+    def get_index_entries(self) -> list[dict]:
+        return self.data_store.get(HISTORY_INDEX) or []
+
+    def get_manifest(self, snapshot_id: str) -> dict | None:
+        if snapshot_id not in self.manifests:
+            manifest = self.data_store.get(get_manifest_key(snapshot_id))
+            if manifest is None:
+                return None
+            self.manifests[snapshot_id] = manifest
+
+        return self.manifests[snapshot_id]
+
+    def load_manifests(self, snapshot_ids):
+        missing = [i for i in snapshot_ids if i not in self.manifests]
+        if not missing:
+            return
+
+        manifests = self.data_store.get_many(
+            [get_manifest_key(i) for i in missing], local_first=True
+        )
+        for snapshot_id in missing:
+            manifest = manifests[get_manifest_key(snapshot_id)]
+            if manifest is None:
+                raise ValueError(f"Missing history snapshot: {snapshot_id}")
+            self.manifests[snapshot_id] = manifest
+
+    def get_snapshot(self, snapshot_id: str) -> SchemaModel | None:
+        manifest = self.get_manifest(snapshot_id)
+        if manifest is None:
+            return None
+
+        self.load_blobs(manifest["types"].values())
+        # Types unchanged between snapshots share the same record
+        return SchemaModel(
+            {name: self.blobs[h] for name, h in manifest["types"].items()},
+            self.strings,
+        )
+
+    def get_type(self, snapshot_id: str, type_name: str) -> TypeRecord | None:
+        manifest = self.get_manifest(snapshot_id)
+        if manifest is None or type_name not in manifest["types"]:
+            return None
+
+        type_hash = manifest["types"][type_name]
+        self.load_blobs([type_hash])
+        return self.blobs[type_hash]
+
+    def load_blobs(self, hashes):
+        missing = {h for h in hashes if h not in self.blobs}
+        if not missing:
+            return
+
+        blobs = self.data_store.get_many(
+            [get_blob_key(h) for h in missing], local_first=True
+        )
+        for type_hash in missing:
+            blob = blobs[get_blob_key(type_hash)]
+            if blob is None:
+                raise ValueError(f"Missing history blob: {type_hash}")
+            self.blobs[type_hash] = TypeRecord.from_json(blob, self.strings.intern)
+
+    def add_snapshot(
+        self, snapshot_id: str, schema_json: dict, created: datetime | None = None
+    ) -> dict:
+        created = (created or datetime.now(timezone.utc)).astimezone(timezone.utc)
+        created = created.isoformat(timespec="seconds")
+
+        # Snapshots are kept in order of creation, not in order they were added,
+        # so backfilled releases land before later snapshots
+        index = [
+            entry for entry in self.get_index_entries() if entry["id"] != snapshot_id
+        ]
+        position = bisect_right(index, created, key=lambda entry: entry["created"])
+
+        # Blobs referenced by preceding snapshot are already stored
+        stored_hashes = set()
+        if position:
+            previous_manifest = self.get_manifest(index[position - 1]["id"])
+            if previous_manifest:
+                stored_hashes.update(previous_manifest["types"].values())
+
+        manifest = {"id": snapshot_id, "created": created, "types": {}}
+        for type_name, type_data in schema_json.items():
+            type_hash = get_blob_hash(type_data)
+            manifest["types"][type_name] = type_hash
+            if type_hash not in stored_hashes:
+                self.data_store.set_local(get_blob_key(type_hash), type_data)
+                stored_hashes.add(type_hash)
+
+        self.data_store.set_local(get_manifest_key(snapshot_id), manifest)
+        self.manifests[snapshot_id] = manifest
+
+        index.insert(position, {"id": snapshot_id, "created": created})
+        self.data_store.set_local(HISTORY_INDEX, index)
+
+        return manifest
+
+
+def get_blob_hash(type_data: dict) -> str:
+    content = json.dumps(type_data, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def get_blob_key(type_hash: str) -> str:
+    return f"{HISTORY_PREFIX}/blobs/{type_hash[:2]}/{type_hash}"
+
+
+def get_manifest_key(snapshot_id: str) -> str:
+    return f"{HISTORY_PREFIX}/snapshots/{snapshot_id}"
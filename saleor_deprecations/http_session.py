@@ -0,0 +1,61 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+HEADER_ETAG = "ETag"
+HEADER_LAST_MODIFIED = "Last-Modified"
+HEADER_IF_NONE_MATCH = "If-None-Match"
+HEADER_IF_MODIFIED_SINCE = "If-Modified-Since"
+
+DEFAULT_TIMEOUT = (5, 60)
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+DEFAULT_POOL_SIZE = 8
+
+RETRY_STATUS_CODES = (500, 502, 503, 504)
+RETRY_METHODS = ("GET", "HEAD")
+
+
+def create_session(
+    retries: int = DEFAULT_RETRIES,
+    backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+    pool_size: int = DEFAULT_POOL_SIZE,
+) -> requests.Session:
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=RETRY_METHODS,
+        # Last response is returned so callers can report its status code
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+    )
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_validators(r: requests.Response) -> dict:
+    return {
+        "etag": r.headers.get(HEADER_ETAG),
+        "last_modified": r.headers.get(HEADER_LAST_MODIFIED),
+    }
+
+
+def get_conditional_headers(validators: dict | None) -> dict:
+    headers = {}
+    if not validators:
+        return headers
+
+    if validators.get("etag"):
+        headers[HEADER_IF_NONE_MATCH] = validators["etag"]
+    if validators.get("last_modified"):
+        headers[HEADER_IF_MODIFIED_SINCE] = validators["last_modified"]
+    return headers
@@ -0,0 +1,83 @@
+import hashlib
+import os
+import pickle
+import shutil
+import tempfile
+import time
+from functools import lru_cache
+from pathlib import Path
+
+import graphql
+from graphql import parse
+
+from . import deprecated_types, schema_builder, schema_json, schema_model
+from .deprecated_types import DeprecatedNode
+from .schema_builder import build_schema_data
+from .source_hash import get_files_hash
+
+# Bump when cached data changes shape for reasons not visible in builder sources
+CACHE_FORMAT = 2
+# Modules whose code shapes cached data
+BUILDER_MODULES = (deprecated_types, schema_builder, schema_json, schema_model)
+MAX_AGE = 14 * 24 * 60 * 60
+
+
+def load_schema_data(
+    schema_sdl: str, cache_path: Path | None = None
+) -> tuple[list[DeprecatedNode], dict]:
+    if not cache_path:
+        return build_schema_data(parse(schema_sdl))
+
+    # Results of other builders are kept in other directories
+    builder_path = cache_path / get_builder_hash()
+    file_path = builder_path / f"{get_cache_key(schema_sdl)}.pickle"
+    try:
+        with open(file_path, "rb") as fp:
+            schema_data = pickle.load(fp)
+        os.utime(file_path)
+        return schema_data
+    except Exception:
+        pass  # Missing, partially written or unreadable by this code
+
+    schema_data = build_schema_data(parse(schema_sdl))
+
+    # Written to temporary file first so concurrent runs never see partial data
+    builder_path.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=builder_path, suffix=".tmp")
+    with os.fdopen(fd, "wb") as fp:
+        pickle.dump(schema_data, fp, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, file_path)
+
+    prune_cache(cache_path, builder_path)
+    return schema_data
+
+
+def prune_cache(cache_path: Path, builder_path: Path):
+    for path in cache_path.iterdir():
+        if path != builder_path:
+            if path.is_dir():
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                path.unlink(missing_ok=True)
+
+    # Loaded entries are touched, so entries not used for a while are dropped
+    expires = time.time() - MAX_AGE
+    for path in builder_path.iterdir():
+        try:
+            if path.stat().st_mtime < expires:
+                path.unlink()
+        except OSError:
+            pass  # Removed by concurrent run
+
+
+def get_cache_key(schema_sdl: str) -> str:
+    return hashlib.sha256(schema_sdl.encode()).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def get_builder_hash() -> str:
+    return get_files_hash(
+        [Path(module.__file__) for module in BUILDER_MODULES],
+        graphql.version,
+        CACHE_FORMAT,
+    )[:16]
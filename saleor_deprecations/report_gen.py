@@ -1,9 +1,20 @@
+import hashlib
+import json
 import re
 from datetime import datetime
+from functools import lru_cache
 from os.path import abspath, dirname
 from pathlib import Path
 
-from jinja2 import Environment, FileSystemLoader, pass_eval_context, select_autoescape
+import jinja2
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    ModuleLoader,
+    pass_eval_context,
+    select_autoescape,
+)
 from markupsafe import Markup, escape
 
 from .deprecated_types import (
@@ -17,27 +28,313 @@ from .deprecated_types import (
     DeprecatedScalarType,
     DeprecatedUnionType,
 )
+from .deprecation_table import DeprecationTable
+from .fragment_cache import FragmentCache
+from .schema_graph import SchemaGraph
+from .schema_similarity import WORD_RE
 
+TEMPLATES_DIR = Path(dirname(abspath(__file__))) / "templates"
+TEMPLATES_HASH_FILE = "templates.sha256"
+TYPE_ENTRIES = ("object", "input", "enum", "scalar", "union")
 
-def generate_report(schema, deprecated_types, file_path):
-    env = Environment(
-        loader=FileSystemLoader(
-            Path(dirname(abspath(__file__))) / "templates",
-        ),
-        autoescape=select_autoescape(),
+STREAM_BUFFER_SIZE = 64
+FILE_BUFFER_SIZE = 256 * 1024
+
+VERSIONS_DIR = "versions"
+TYPES_DIR = "types"
+REDIRECTS_FILE = "redirects.json"
+SEARCH_INDEX_FILE = "search-index.json"
+SEARCH_MESSAGE_WORD_MIN_LENGTH = 3
+SEARCH_RESULTS_LIMIT = 20
+UNKNOWN_VERSION = "unknown"
+TYPES_PAGE = "types"
+# Rows of summary tables on version pages and detail blocks on type pages
+VERSION_PAGE_SIZE = 500
+TYPE_PAGE_SIZE = 100
+TYPES_PAGE_SIZE = 500
+
+
+def generate_report(
+    schema, deprecated_types, file_path, graph=None, env=None, fragments_path=None
+):
+    env = env or get_environment()
+    fragments = None
+    if fragments_path:
+        fragments = FragmentCache(env, fragments_path, TEMPLATES_DIR)
+    if iter(deprecated_types) is deprecated_types:
+        deprecated_types = list(deprecated_types)
+
+    write_search_index(
+        DeprecationTable(deprecated_types), Path(file_path).parent / SEARCH_INDEX_FILE
     )
-    env.filters["parse"] = parse_markdown
 
     data = {
         "gen_time": datetime.now(),
-        "deprecated_types": list(
-            get_deprecated_types_data(schema, deprecated_types)
-        ),
+        "deprecated_types": DeprecatedTypesData(schema, deprecated_types, graph),
+        "fragments": fragments,
+        "search_root": "",
     }
 
-    template = env.get_template("index.html")
-    with open(file_path, "w+") as fp:
-        fp.write(template.render(**data))
+    render_template(env, "index.html", file_path, data)
+    if fragments:
+        fragments.save()
+
+
+def generate_sharded_report(
+    schema, deprecated_types, output_dir, graph=None, env=None, fragments_path=None
+):
+    env = env or get_environment()
+    fragments = None
+    if fragments_path:
+        fragments = FragmentCache(env, fragments_path, TEMPLATES_DIR)
+    output_dir = Path(output_dir)
+    for pages_dir in (VERSIONS_DIR, TYPES_DIR):
+        (output_dir / pages_dir).mkdir(parents=True, exist_ok=True)
+        for stale_page in (output_dir / pages_dir).glob("*.html"):
+            stale_page.unlink()
+    for stale_page in output_dir.glob(f"{TYPES_PAGE}*.html"):
+        stale_page.unlink()
+
+    table = DeprecationTable(deprecated_types)
+    gen_time = datetime.now()
+
+    # Every deprecation is detailed on exactly one page of its type
+    redirects = {}
+    owners = []
+    for owner in sorted(table.by_owner):
+        rows = table.by_owner[owner]
+        pages = get_pages(f"{TYPES_DIR}/{owner}", rows, TYPE_PAGE_SIZE)
+        for page_url, page_rows in pages:
+            for row in page_rows:
+                row_id = get_row_id(table, row)
+                redirects[row_id] = f"{page_url}#{row_id}"
+        owners.append({"name": owner, "count": len(rows), "url": pages[0][0]})
+
+        for page_url, page_rows in pages:
+            render_template(
+                env,
+                "sharded-type.html",
+                output_dir / page_url,
+                {
+                    "gen_time": gen_time,
+                    "search_root": "../",
+                    "index_url": "../index.html",
+                    "owner": owner,
+                    "deprecated_types": DeprecatedTypesData(
+                        schema, [table[row] for row in page_rows], graph
+                    ),
+                    "fragments": fragments,
+                    "pages": get_pages_links(pages, page_url),
+                },
+            )
+
+    versions = []
+    for version in table.get_versions():
+        rows = table.by_version[version]
+        version_name = version or UNKNOWN_VERSION
+        pages = get_pages(f"{VERSIONS_DIR}/{version_name}", rows, VERSION_PAGE_SIZE)
+        versions.append(
+            {"version": version_name, "count": len(rows), "url": pages[0][0]}
+        )
+
+        for page_url, page_rows in pages:
+            render_template(
+                env,
+                "sharded-version.html",
+                output_dir / page_url,
+                {
+                    "gen_time": gen_time,
+                    "search_root": "../",
+                    "index_url": "../index.html",
+                    "version": version_name,
+                    "deprecated_types": DeprecatedTypesData(
+                        schema,
+                        [table[row] for row in page_rows],
+                        get_url=lambda type_id: f"../{redirects[type_id]}",
+                    ),
+                    "pages": get_pages_links(pages, page_url),
+                },
+            )
+
+    types_pages = get_pages(TYPES_PAGE, owners, TYPES_PAGE_SIZE)
+    for page_url, page_owners in types_pages:
+        render_template(
+            env,
+            "sharded-types.html",
+            output_dir / page_url,
+            {
+                "gen_time": gen_time,
+                "search_root": "",
+                "index_url": "index.html",
+                "owners": page_owners,
+                "pages": get_pages_links(types_pages, page_url),
+            },
+        )
+
+    if fragments:
+        fragments.save()
+
+    with open(output_dir / REDIRECTS_FILE, "w") as fp:
+        json.dump(redirects, fp, separators=(",", ":"))
+    write_search_index(table, output_dir / SEARCH_INDEX_FILE, redirects.__getitem__)
+
+    render_template(
+        env,
+        "sharded-index.html",
+        output_dir / "index.html",
+        {
+            "gen_time": gen_time,
+            "search_root": "",
+            "versions": versions,
+            "types_url": types_pages[0][0] if types_pages else None,
+            "redirects_url": REDIRECTS_FILE,
+        },
+    )
+
+
+def write_search_index(table, file_path, get_url=None):
+    # Inverted index of lowercased words to rows, rows are stored as
+    # [url, label, version] lists
+    docs = []
+    terms = {}
+    for row in range(len(table)):
+        row_id = get_row_id(table, row)
+        owner, member, argument = (
+            table.owners[row],
+            table.members[row],
+            table.arguments[row],
+        )
+        label = owner
+        if member:
+            label += f".{member}"
+        if argument:
+            label += f"({argument})"
+        version = table.versions[row] or UNKNOWN_VERSION
+        docs.append([get_url(row_id) if get_url else f"#{row_id}", label, version])
+
+        tokens = {version}
+        for name in (owner, member, argument):
+            if name:
+                tokens.add(name.lower())
+                tokens.update(word.lower() for word in WORD_RE.findall(name))
+        tokens.update(
+            word.lower()
+            for word in WORD_RE.findall(table.messages[row] or "")
+            if len(word) >= SEARCH_MESSAGE_WORD_MIN_LENGTH
+        )
+        for token in tokens:
+            terms.setdefault(token, []).append(row)
+
+    with open(file_path, "w") as fp:
+        json.dump({"docs": docs, "terms": terms}, fp, separators=(",", ":"))
+
+
+def render_template(env, template_name, file_path, data):
+    stream = env.get_template(template_name).stream(**data)
+    stream.enable_buffering(STREAM_BUFFER_SIZE)
+    with open(file_path, "w+", buffering=FILE_BUFFER_SIZE) as fp:
+        stream.dump(fp)
+
+
+def get_pages(path, rows, page_size):
+    pages = []
+    for start in range(0, len(rows), page_size):
+        suffix = f"-{start // page_size + 1}" if start else ""
+        pages.append((f"{path}{suffix}.html", rows[start : start + page_size]))
+    return pages
+
+
+def get_pages_links(pages, current_url):
+    return [
+        {"url": page_url.rpartition("/")[2], "current": page_url == current_url}
+        for page_url, _ in pages
+    ]
+
+
+def get_row_id(table, row):
+    names = (table.owners[row], table.members[row], table.arguments[row])
+    return "-".join(name for name in names if name)
+
+
+class DeprecatedTypesData:
+    # Entries are generated again on every iteration instead of being kept
+    # in memory, templates can loop over them more than once
+    def __init__(self, schema, deprecated_types, graph=None, get_url=None):
+        if iter(deprecated_types) is deprecated_types:
+            deprecated_types = list(deprecated_types)
+
+        self.schema = schema
+        self.deprecated_types = deprecated_types
+        self.graph = graph
+        self.get_url = get_url
+
+    def __iter__(self):
+        deprecated_types_data = get_deprecated_types_data(
+            self.schema, self.deprecated_types
+        )
+        if self.graph:
+            deprecated_types_data = attach_references(deprecated_types_data, self.graph)
+        if self.get_url:
+            deprecated_types_data = attach_urls(deprecated_types_data, self.get_url)
+        return deprecated_types_data
+
+
+@lru_cache(maxsize=None)
+def get_environment(cache_path=None, compiled_path=None):
+    # Environment keeps compiled templates in memory, so it's shared by all reports
+    if compiled_path:
+        compiled_path = Path(compiled_path)
+        if get_compiled_templates_hash(compiled_path) != get_templates_hash():
+            compile_templates(compiled_path)
+        loader = ModuleLoader(compiled_path)
+    else:
+        loader = FileSystemLoader(TEMPLATES_DIR)
+
+    bytecode_cache = None
+    if cache_path:
+        Path(cache_path).mkdir(parents=True, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(cache_path)
+
+    return create_environment(loader, bytecode_cache)
+
+
+def create_environment(loader, bytecode_cache=None):
+    env = Environment(
+        loader=loader,
+        autoescape=select_autoescape(),
+        bytecode_cache=bytecode_cache,
+    )
+    env.filters["parse"] = parse_markdown
+    env.globals["search_index_file"] = SEARCH_INDEX_FILE
+    env.globals["search_results_limit"] = SEARCH_RESULTS_LIMIT
+    return env
+
+
+def compile_templates(compiled_path):
+    compiled_path = Path(compiled_path)
+    compiled_path.mkdir(parents=True, exist_ok=True)
+    for stale_module in compiled_path.glob("tmpl_*.py"):
+        stale_module.unlink()
+
+    env = create_environment(FileSystemLoader(TEMPLATES_DIR))
+    env.compile_templates(compiled_path, zip=None, ignore_errors=False)
+    (compiled_path / TEMPLATES_HASH_FILE).write_text(get_templates_hash())
+
+
+def get_compiled_templates_hash(compiled_path):
+    try:
+        return (compiled_path / TEMPLATES_HASH_FILE).read_text()
+    except FileNotFoundError:
+        return None
+
+
+def get_templates_hash():
+    # Compiled modules depend on Jinja version as much as on templates sources
+    templates_hash = hashlib.sha256(jinja2.__version__.encode())
+    for template_path in sorted(TEMPLATES_DIR.glob("*.html")):
+        templates_hash.update(template_path.name.encode())
+        templates_hash.update(template_path.read_bytes())
+    return templates_hash.hexdigest()
 
 
 def get_deprecated_types_data(schema, deprecated_types):
@@ -156,6 +453,19 @@ def get_deprecated_types_data(schema, deprecated_types):
             }
 
 
+def attach_references(deprecated_types_data, graph: SchemaGraph):
+    for type_data in deprecated_types_data:
+        if type_data["type"] in TYPE_ENTRIES:
+            type_data["references"] = graph.get_references(type_data[type_data["type"]])
+        yield type_data
+
+
+def attach_urls(deprecated_types_data, get_url):
+    for type_data in deprecated_types_data:
+        type_data["url"] = get_url(type_data["id"])
+        yield type_data
+
+
 @pass_eval_context
 def parse_markdown(eval_ctx, value):
     if eval_ctx.autoescape:
@@ -0,0 +1,340 @@
+import hashlib
+
+from graphql.language import (
+    DirectiveDefinitionNode,
+    DocumentNode,
+    EnumTypeDefinitionNode,
+    FieldDefinitionNode,
+    InputObjectTypeDefinitionNode,
+    InputValueDefinitionNode,
+    InterfaceTypeDefinitionNode,
+    ListTypeNode,
+    NamedTypeNode,
+    NonNullTypeNode,
+    ObjectTypeDefinitionNode,
+    ScalarTypeDefinitionNode,
+    SchemaDefinitionNode,
+    UnionTypeDefinitionNode,
+)
+
+from .deprecated_types import (
+    DeprecatedEnumType,
+    DeprecatedEnumValueType,
+    DeprecatedInputType,
+    DeprecatedInputFieldType,
+    DeprecatedNode,
+    DeprecatedObjectType,
+    DeprecatedObjectFieldType,
+    DeprecatedObjectFieldArgumentType,
+    DeprecatedScalarType,
+    DeprecatedUnionType,
+    get_deprecated_status,
+)
+from .schema_json import get_description, print_value_node
+from .schema_model import (
+    EnumValueRecord,
+    FieldRecord,
+    InputValueRecord,
+    Intern,
+    SchemaModel,
+    StringTable,
+    TypeRecord,
+)
+
+HASH_SIZE = 6
+
+
+def build_schema_data(
+    schema_ast: DocumentNode,
+) -> tuple[list[DeprecatedNode], dict]:
+    deprecated_types, schema_model = build_schema_model(schema_ast)
+    return deprecated_types, schema_model.to_json()
+
+
+def build_schema_model(
+    schema_ast: DocumentNode, strings: StringTable | None = None
+) -> tuple[list[DeprecatedNode], SchemaModel]:
+    deprecated_types: list[DeprecatedNode] = []
+    schema_model = SchemaModel(strings=strings)
+    intern = schema_model.strings.intern
+
+    for graphql_type in schema_ast.definitions:
+        try:
+            build_type = TYPE_BUILDERS[type(graphql_type)]
+        except KeyError:
+            raise ValueError(f"Unknown node type: {type(graphql_type).__name__}")
+
+        if build_type:
+            schema_model.types[intern(graphql_type.name.value)] = build_type(
+                graphql_type, deprecated_types, intern
+            )
+
+    return deprecated_types, schema_model
+
+
+def build_object_type(
+    node: ObjectTypeDefinitionNode | InterfaceTypeDefinitionNode,
+    deprecated_types: list[DeprecatedNode],
+    intern: Intern,
+) -> TypeRecord:
+    name = node.name.value
+    interface = type(node) is InterfaceTypeDefinitionNode
+    deprecated = message = None
+    if status := get_deprecated_status(node):
+        deprecated, message = status
+        deprecated_types.append(
+            DeprecatedObjectType(*status, interface=interface, object=name)
+        )
+
+    fields = {}
+    for field in node.fields:
+        field_name = field.name.value
+        field_deprecated = field_message = None
+        if status := get_deprecated_status(field):
+            field_deprecated, field_message = status
+            deprecated_types.append(
+                DeprecatedObjectFieldType(
+                    *status, interface=interface, object=name, field=field_name
+                )
+            )
+
+        field_type = intern(print_type_node(field.type))
+        field_description = intern(get_description(field))
+        args = build_object_field_args(node, field, interface, deprecated_types, intern)
+        fields[intern(field_name)] = FieldRecord(
+            field_type,
+            field_description,
+            intern(field_deprecated),
+            intern(field_message),
+            args,
+            get_node_hash(
+                field_type,
+                field_description,
+                field_deprecated,
+                field_message,
+                get_members_hashes(args),
+            ),
+        )
+
+    kind = "interface" if interface else "object"
+    description = intern(get_description(node))
+    interfaces = tuple(intern(i.name.value) for i in node.interfaces)
+    return TypeRecord(
+        kind,
+        description,
+        intern(deprecated),
+        intern(message),
+        interfaces=interfaces,
+        members=fields,
+        hash=get_node_hash(
+            kind,
+            description,
+            deprecated,
+            message,
+            interfaces,
+            get_members_hashes(fields),
+        ),
+    )
+
+
+def build_object_field_args(
+    node: ObjectTypeDefinitionNode | InterfaceTypeDefinitionNode,
+    field: FieldDefinitionNode,
+    interface: bool,
+    deprecated_types: list[DeprecatedNode],
+    intern: Intern,
+) -> dict[str, InputValueRecord]:
+    args = {}
+    for arg in field.arguments:
+        deprecated = message = None
+        if status := get_deprecated_status(arg):
+            deprecated, message = status
+            deprecated_types.append(
+                DeprecatedObjectFieldArgumentType(
+                    *status,
+                    interface=interface,
+                    object=node.name.value,
+                    field=field.name.value,
+                    argument=arg.name.value,
+                )
+            )
+        args[intern(arg.name.value)] = build_input_value(
+            arg, deprecated, message, intern
+        )
+
+    return args
+
+
+def build_input_type(
+    node: InputObjectTypeDefinitionNode,
+    deprecated_types: list[DeprecatedNode],
+    intern: Intern,
+) -> TypeRecord:
+    name = node.name.value
+    deprecated = message = None
+    if status := get_deprecated_status(node):
+        deprecated, message = status
+        deprecated_types.append(DeprecatedInputType(*status, input=name))
+
+    fields = {}
+    for field in node.fields:
+        field_deprecated = field_message = None
+        if status := get_deprecated_status(field):
+            field_deprecated, field_message = status
+            deprecated_types.append(
+                DeprecatedInputFieldType(*status, input=name, field=field.name.value)
+            )
+        fields[intern(field.name.value)] = build_input_value(
+            field, field_deprecated, field_message, intern
+        )
+
+    description = intern(get_description(node))
+    return TypeRecord(
+        "input",
+        description,
+        intern(deprecated),
+        intern(message),
+        members=fields,
+        hash=get_node_hash(
+            "input", description, deprecated, message, get_members_hashes(fields)
+        ),
+    )
+
+
+def build_input_value(
+    node: InputValueDefinitionNode,
+    deprecated: str | None,
+    message: str | None,
+    intern: Intern,
+) -> InputValueRecord:
+    value_type = intern(print_type_node(node.type))
+    description = intern(get_description(node))
+    default = print_value_node(node.default_value)
+    return InputValueRecord(
+        value_type,
+        description,
+        intern(deprecated),
+        intern(message),
+        intern(default) if isinstance(default, str) else default,
+        get_node_hash(value_type, description, deprecated, message, default),
+    )
+
+
+def build_enum_type(
+    node: EnumTypeDefinitionNode,
+    deprecated_types: list[DeprecatedNode],
+    intern: Intern,
+) -> TypeRecord:
+    name = node.name.value
+    deprecated = message = None
+    if status := get_deprecated_status(node):
+        deprecated, message = status
+        deprecated_types.append(DeprecatedEnumType(*status, enum=name))
+
+    values = {}
+    values_state = []
+    for value in node.values:
+        value_deprecated = value_message = None
+        if status := get_deprecated_status(value):
+            value_deprecated, value_message = status
+            deprecated_types.append(
+                DeprecatedEnumValueType(*status, enum=name, value=value.name.value)
+            )
+        value_name = intern(value.name.value)
+        value_description = intern(get_description(value))
+        values[value_name] = EnumValueRecord(
+            value_description, intern(value_deprecated), intern(value_message)
+        )
+        # Enum values are small, so they are hashed only as part of their type
+        values_state.append(
+            (value_name, value_description, value_deprecated, value_message)
+        )
+
+    description = intern(get_description(node))
+    return TypeRecord(
+        "enum",
+        description,
+        intern(deprecated),
+        intern(message),
+        members=values,
+        hash=get_node_hash(
+            "enum", description, deprecated, message, sorted(values_state)
+        ),
+    )
+
+
+def build_scalar_type(
+    node: ScalarTypeDefinitionNode,
+    deprecated_types: list[DeprecatedNode],
+    intern: Intern,
+) -> TypeRecord:
+    deprecated = message = None
+    if status := get_deprecated_status(node):
+        deprecated, message = status
+        deprecated_types.append(DeprecatedScalarType(*status, scalar=node.name.value))
+
+    description = intern(get_description(node))
+    return TypeRecord(
+        "scalar",
+        description,
+        intern(deprecated),
+        intern(message),
+        hash=get_node_hash("scalar", description, deprecated, message),
+    )
+
+
+def build_union_type(
+    node: UnionTypeDefinitionNode,
+    deprecated_types: list[DeprecatedNode],
+    intern: Intern,
+) -> TypeRecord:
+    deprecated = message = None
+    if status := get_deprecated_status(node):
+        deprecated, message = status
+        deprecated_types.append(DeprecatedUnionType(*status, union=node.name.value))
+
+    description = intern(get_description(node))
+    types = tuple(intern(t.name.value) for t in node.types)
+    return TypeRecord(
+        "union",
+        description,
+        intern(deprecated),
+        intern(message),
+        types=types,
+        hash=get_node_hash("union", description, deprecated, message, types),
+    )
+
+
+TYPE_BUILDERS = {
+    ObjectTypeDefinitionNode: build_object_type,
+    InterfaceTypeDefinitionNode: build_object_type,
+    InputObjectTypeDefinitionNode: build_input_type,
+    EnumTypeDefinitionNode: build_enum_type,
+    ScalarTypeDefinitionNode: build_scalar_type,
+    UnionTypeDefinitionNode: build_union_type,
+    # We skip some nodes that don't have deprecations
+    SchemaDefinitionNode: None,
+    DirectiveDefinitionNode: None,
+}
+
+
+def get_node_hash(*values) -> str:
+    # Hashes cover a node with its children, so equal hashes mean equal JSON.
+    # repr of str, numbers, None, lists and dicts is the same between runs.
+    content = repr(values).encode()
+    return hashlib.blake2b(content, digest_size=HASH_SIZE).hexdigest()
+
+
+def get_members_hashes(members: dict) -> list[tuple[str, str]]:
+    return sorted((name, member.hash) for name, member in members.items())
+
+
+def print_type_node(type_node: NamedTypeNode | ListTypeNode | NonNullTypeNode):
+    return TYPE_PRINTERS[type(type_node)](type_node)
+
+
+TYPE_PRINTERS = {
+    NamedTypeNode: lambda node: node.name.value,
+    ListTypeNode: lambda node: f"[{print_type_node(node.type)}]",
+    NonNullTypeNode: lambda node: f"{print_type_node(node.type)}!",
+}
@@ -1,428 +1,254 @@
-def diff_schemas(old_schema: dict, current_schema: dict) -> list:
-    differences = []
-
-    # Types
-    differences += find_new_types(old_schema, current_schema)
-    differences += find_deleted_types(old_schema, current_schema)
-    differences += find_deprecated_types(old_schema, current_schema)
-
-    # Objects/Interfaces/Inputs
-    differences += find_new_fields(old_schema, current_schema)
-    differences += find_deleted_fields(old_schema, current_schema)
-    differences += find_deprecated_fields(old_schema, current_schema)
-
-    # Objects/Interfaces
-    differences += find_new_fields_arguments(old_schema, current_schema)
-    differences += find_deleted_fields_arguments(old_schema, current_schema)
-    differences += find_deprecated_fields_arguments(old_schema, current_schema)
-
-    # Enums
-    differences += find_new_enums_values(old_schema, current_schema)
-    differences += find_deleted_enums_values(old_schema, current_schema)
-    differences += find_deprecated_enums_values(old_schema, current_schema)
-
-    # Unions
-    differences += find_new_unions_types(old_schema, current_schema)
-    differences += find_deleted_unions_types(old_schema, current_schema)
-
-    return differences
-
-
-def find_new_types(old_schema, current_schema) -> list:
-    differences = []
-    for current_name, current_data in current_schema.items():
-        if (
-            current_name in old_schema
-            and current_data["type"] == old_schema[current_name]["type"]
-        ):
-            continue
-
-        differences.append({"diff": "type_new", "type": current_name})
-
-    return differences
-
-
-def find_deleted_types(old_schema, current_schema) -> list:
-    differences = []
-    for old_name, old_data in old_schema.items():
-        if (
-            old_name in current_schema
-            and old_data["type"] == current_schema[old_name]["type"]
-        ):
-            continue
-
-        differences.append({"diff": "type_deleted", "type": old_name})
-
-    return differences
-
-
-def find_deprecated_types(old_schema, current_schema) -> list:
-    differences = []
-    for current_name, current_data in current_schema.items():
-        if not current_data["deprecated"]:
-            continue
-
-        if (
-            current_name not in old_schema
-            or current_data["type"] != old_schema[current_name]["type"]
-        ):
-            continue
-
-        if current_data["deprecated"] != old_schema[current_name]["deprecated"]:
-            differences.append(
-                {
-                    "diff": "type_deprecated",
-                    "type": current_name,
-                    "version": current_data["deprecated"],
-                }
+from operator import itemgetter
+from typing import Iterable, Iterator
+
+from .diff_rules import (
+    BUILTIN_RULES,
+    CHANGED,
+    DELETED,
+    NEW,
+    DiffRule,
+    DiffTable,
+    compile_rules,
+)
+from .schema_similarity import get_field_tokens, get_type_tokens, match_similar
+
+DIFF_KINDS = tuple(rule.kind for rule in BUILTIN_RULES)
+# Produced by diff_schemas from pairs of deleted and new types or fields
+RENAME_KINDS = ("type_renamed", "field_renamed", "field_moved")
+# Moves are matched across all types, so they need closer and richer matches
+MOVE_THRESHOLD = 0.75
+MOVE_MIN_TOKENS = 4
+
+
+def diff_schemas(
+    old_schema: dict,
+    current_schema: dict,
+    renames: bool = False,
+    rules: Iterable[DiffRule] | None = None,
+) -> list:
+    rules = BUILTIN_RULES if rules is None else tuple(rules)
+    kinds = tuple(dict.fromkeys(rule.kind for rule in rules)) + RENAME_KINDS
+
+    differences = {kind: [] for kind in kinds}
+    for diff in iter_diff(old_schema, current_schema, rules=rules):
+        differences[diff["diff"]].append(diff)
+
+    if renames:
+        detect_renames(differences, old_schema, current_schema)
+
+    return [diff for kind in kinds for diff in differences[kind]]
+
+
+def detect_renames(differences: dict, old_schema: dict, current_schema: dict):
+    type_matches = match_similar(
+        {
+            (old_schema[d["type"]]["type"], d["type"]): get_type_tokens(
+                d["type"], old_schema[d["type"]]
             )
-
-    return differences
-
-
-def find_new_fields(old_schema, current_schema) -> list:
-    differences = []
-    for current_name, current_data in current_schema.items():
-        if current_data["type"] not in ("object", "interface", "input"):
-            continue
-
-        if (
-            current_name not in old_schema
-            or current_data["type"] != old_schema[current_name]["type"]
-        ):
-            continue
-
-        current_fields = current_data["fields"]
-        old_fields = old_schema[current_name]["fields"]
-
-        for current_field in current_fields:
-            if current_field in old_fields:
-                continue
-
-            differences.append(
-                {
-                    "diff": "field_new",
-                    "type": current_name,
-                    "field": current_field,
-                }
+            for d in differences.get("type_deleted", ())
+        },
+        {
+            (current_schema[d["type"]]["type"], d["type"]): get_type_tokens(
+                d["type"], current_schema[d["type"]]
             )
-
-    return differences
-
-
-def find_deleted_fields(old_schema, current_schema) -> list:
-    differences = []
-    for current_name, current_data in current_schema.items():
-        if current_data["type"] not in ("object", "interface", "input"):
-            continue
-
-        if (
-            current_name not in old_schema
-            or current_data["type"] != old_schema[current_name]["type"]
-        ):
-            continue
-
-        current_fields = current_data["fields"]
-        old_fields = old_schema[current_name]["fields"]
-
-        for old_field in old_fields:
-            if old_field in current_fields:
-                continue
-
-            differences.append(
-                {
-                    "diff": "field_deleted",
-                    "type": current_name,
-                    "field": old_field,
-                }
-            )
-
-    return differences
-
-
-def find_deprecated_fields(old_schema, current_schema) -> list:
-    differences = []
-    for current_name, current_data in current_schema.items():
-        if current_data["type"] not in ("object", "interface", "input"):
-            continue
-
-        if (
-            current_name not in old_schema
-            or current_data["type"] != old_schema[current_name]["type"]
-        ):
-            continue
-
-        current_fields = current_data["fields"]
-        old_fields = old_schema[current_name]["fields"]
-
-        for current_field, current_field_data in current_fields.items():
-            if not current_field_data["deprecated"] or current_field not in old_fields:
-                continue
-
-            old_field_data = old_fields[current_field]
-            if current_field_data["deprecated"] != old_field_data["deprecated"]:
-                differences.append(
-                    {
-                        "diff": "field_deprecated",
-                        "type": current_name,
-                        "field": current_field,
-                        "version": current_field_data["deprecated"],
-                    }
-                )
-
-    return differences
-
-
-def find_new_fields_arguments(old_schema, current_schema) -> list:
-    differences = []
-    for current_name, current_data in current_schema.items():
-        if current_data["type"] != ("object", "interface"):
-            continue
-
-        if (
-            current_name not in old_schema
-            or current_data["type"] != old_schema[current_name]["type"]
-        ):
-            continue
-
-        current_fields = current_data["fields"]
-        old_fields = old_schema[current_name]["fields"]
-
-        for current_field, current_field_data in current_fields.items():
-            if not current_field_data["arguments"] or current_field not in old_fields:
-                continue
-
-            old_arguments = old_fields[current_field]["arguments"]
-            for current_argument in current_field_data["arguments"]:
-                if current_argument not in old_arguments:
-                    differences.append(
-                        {
-                            "diff": "argument_new",
-                            "type": current_name,
-                            "field": current_field,
-                            "argument": current_argument,
-                        }
-                    )
-
-    return differences
-
-
-def find_deleted_fields_arguments(old_schema, current_schema) -> list:
-    differences = []
-    for current_name, current_data in current_schema.items():
-        if current_data["type"] != ("object", "interface"):
-            continue
-
-        if (
-            current_name not in old_schema
-            or current_data["type"] != old_schema[current_name]["type"]
-        ):
-            continue
-
-        current_fields = current_data["fields"]
-        old_fields = old_schema[current_name]["fields"]
-
-        for current_field, current_field_data in current_fields.items():
-            if (
-                not old_fields[current_field]["arguments"]
-                or current_field not in old_fields
-            ):
+            for d in differences.get("type_new", ())
+        },
+    )
+    renamed_types = [(old, new) for (_, old), (_, new) in type_matches if old != new]
+    remove_matched(differences, "type", renamed_types)
+    differences["type_renamed"] = [
+        {"diff": "type_renamed", "type": new, "old_type": old}
+        for old, new in renamed_types
+    ]
+
+    # Fields are first paired within their type, the rest may have moved
+    old_fields = get_fields_tokens(differences.get("field_deleted", ()), old_schema)
+    new_fields = get_fields_tokens(differences.get("field_new", ()), current_schema)
+    renamed_fields = match_similar(old_fields, new_fields)
+    remove_matched(differences, "field", renamed_fields)
+    differences["field_renamed"] = [
+        {
+            "diff": "field_renamed",
+            "type": type_name,
+            "field": new_field,
+            "old_field": old_field,
+        }
+        for (type_name, old_field), (_, new_field) in renamed_fields
+    ]
+
+    matched_old = {old for old, _ in renamed_fields}
+    matched_new = {new for _, new in renamed_fields}
+    moved_fields = match_similar(
+        {
+            ("", *key): tokens
+            for key, tokens in old_fields.items()
+            if key not in matched_old and len(tokens) >= MOVE_MIN_TOKENS
+        },
+        {
+            ("", *key): tokens
+            for key, tokens in new_fields.items()
+            if key not in matched_new and len(tokens) >= MOVE_MIN_TOKENS
+        },
+        MOVE_THRESHOLD,
+    )
+    moved_fields = [(old[1:], new[1:]) for old, new in moved_fields if old[1] != new[1]]
+    remove_matched(differences, "field", moved_fields)
+    differences["field_moved"] = [
+        {
+            "diff": "field_moved",
+            "type": new_type,
+            "field": new_field,
+            "old_type": old_type,
+            "old_field": old_field,
+        }
+        for (old_type, old_field), (new_type, new_field) in moved_fields
+    ]
+
+
+def get_fields_tokens(differences: Iterable[dict], schema: dict) -> dict:
+    return {
+        (d["type"], d["field"]): get_field_tokens(
+            d["field"], schema[d["type"]]["fields"][d["field"]]
+        )
+        for d in differences
+    }
+
+
+def remove_matched(differences: dict, member: str, matches: list):
+    # Types are matched by name, fields by type and field name
+    get_key = itemgetter("type") if member == "type" else itemgetter("type", "field")
+    matched_old = {old for old, _ in matches}
+    matched_new = {new for _, new in matches}
+    differences[f"{member}_deleted"] = [
+        d
+        for d in differences.get(f"{member}_deleted", ())
+        if get_key(d) not in matched_old
+    ]
+    differences[f"{member}_new"] = [
+        d for d in differences.get(f"{member}_new", ()) if get_key(d) not in matched_new
+    ]
+
+
+def iter_diff(
+    old_schema: dict,
+    current_schema: dict,
+    kinds: Iterable[str] | None = None,
+    types: Iterable[str] | None = None,
+    rules: Iterable[DiffRule] | None = None,
+) -> Iterator[dict]:
+    rules = BUILTIN_RULES if rules is None else tuple(rules)
+    if kinds is not None:
+        kinds = frozenset(kinds)
+        if unknown_kinds := kinds.difference(rule.kind for rule in rules):
+            raise ValueError(f"Unknown diff kinds: {', '.join(sorted(unknown_kinds))}")
+        rules = tuple(rule for rule in rules if rule.kind in kinds)
+
+    table = compile_rules(rules)
+    type_names = current_schema if types is None else types
+
+    for current_name in type_names:
+        current_data = current_schema.get(current_name)
+        if current_data is None:
+            continue
+
+        type_kind = current_data["type"]
+        old_data = old_schema.get(current_name)
+        if old_data is None or type_kind != old_data["type"]:
+            for rule in table.get(type_kind, "", NEW):
+                yield rule.get_record((current_name,))
+            continue
+
+        # Rules only report differences, so equal types can be skipped as a whole
+        if is_unchanged(old_data, current_data):
+            continue
+
+        names = (current_name,)
+        for rule in table.get(type_kind, "", CHANGED):
+            values = rule.compare(old_data, current_data)
+            if values is not None:
+                yield rule.get_record(names, values)
+
+        if (type_kind, "") in table.children:
+            yield from diff_members(table, type_kind, "", names, old_data, current_data)
+
+    if not table.has_rules("", DELETED):
+        return
+
+    for old_name in old_schema if types is None else types:
+        old_data = old_schema.get(old_name)
+        if old_data is None:
+            continue
+
+        current_data = current_schema.get(old_name)
+        if current_data is None or old_data["type"] != current_data["type"]:
+            for rule in table.get(old_data["type"], "", DELETED):
+                yield rule.get_record((old_name,))
+
+
+def diff_members(
+    table: DiffTable,
+    type_kind: str,
+    path: str,
+    names: tuple[str, ...],
+    old_data: dict,
+    current_data: dict,
+) -> Iterator[dict]:
+    for (
+        collection,
+        members_path,
+        new_rules,
+        changed_rules,
+        deleted_rules,
+        children,
+    ) in table.collections[(type_kind, path)]:
+        old_members = get_members(old_data, collection)
+        current_members = get_members(current_data, collection)
+
+        for member, member_data in current_members.items():
+            if member not in old_members:
+                for rule in new_rules:
+                    yield rule.get_record((*names, member))
                 continue
 
-            current_arguments = current_field_data["arguments"]
-            for old_argument in old_fields[current_field]["arguments"]:
-                if old_argument not in current_arguments:
-                    differences.append(
-                        {
-                            "diff": "argument_deleted",
-                            "type": current_name,
-                            "field": current_field,
-                            "argument": old_argument,
-                        }
-                    )
-
-    return differences
-
-
-def find_deprecated_fields_arguments(old_schema, current_schema) -> list:
-    differences = []
-    for current_name, current_data in current_schema.items():
-        if current_data["type"] != ("object", "interface"):
-            continue
-
-        if (
-            current_name not in old_schema
-            or current_data["type"] != old_schema[current_name]["type"]
-        ):
-            continue
-
-        current_fields = current_data["fields"]
-        old_fields = old_schema[current_name]["fields"]
-
-        for current_field, current_field_data in current_fields.items():
-            if not current_field_data["arguments"] or current_field not in old_fields:
+            old_member_data = old_members[member]
+            if is_unchanged(old_member_data, member_data):
                 continue
 
-            old_field_arguments = old_fields[current_field]["arguments"]
-            if not old_field_arguments:
-                continue
-
-            for current_argument, current_argument_data in current_field_data[
-                "arguments"
-            ].items():
-                if (
-                    not current_argument_data["deprecated"]
-                    or current_argument not in old_field_arguments
-                ):
-                    continue
-
-                if (
-                    current_argument_data["deprecated"]
-                    != old_field_arguments[current_argument]["deprecated"]
-                ):
-                    differences.append(
-                        {
-                            "diff": "argument_deprecated",
-                            "type": current_name,
-                            "field": current_field,
-                            "argument": current_argument,
-                            "version": current_argument_data["deprecated"],
-                        }
-                    )
-
-    return differences
-
-
-def find_new_enums_values(old_schema, current_schema) -> list:
-    differences = []
-    for current_name, current_data in current_schema.items():
-        if current_data["type"] != "enum":
-            continue
-
-        if (
-            current_name not in old_schema
-            or current_data["type"] != old_schema[current_name]["type"]
-        ):
-            continue
-
-        old_values = old_schema[current_name]["values"]
-        for current_value in current_data["values"]:
-            if current_value not in old_values:
-                differences.append(
-                    {
-                        "diff": "enum_value_new",
-                        "enum": current_name,
-                        "value": current_value,
-                    }
-                )
-
-    return differences
-
-
-def find_deleted_enums_values(old_schema, current_schema) -> list:
-    differences = []
-    for current_name, current_data in current_schema.items():
-        if current_data["type"] != "enum":
-            continue
-
-        if (
-            current_name not in old_schema
-            or current_data["type"] != old_schema[current_name]["type"]
-        ):
-            continue
-
-        for old_value in old_schema[current_name]["values"]:
-            if old_value not in current_data["values"]:
-                differences.append(
-                    {
-                        "diff": "enum_value_deleted",
-                        "enum": current_name,
-                        "value": old_value,
-                    }
-                )
-
-    return differences
-
-
-def find_deprecated_enums_values(old_schema, current_schema) -> list:
-    differences = []
-    for current_name, current_data in current_schema.items():
-        if current_data["type"] != "enum":
-            continue
-
-        if (
-            current_name not in old_schema
-            or current_data["type"] != old_schema[current_name]["type"]
-        ):
-            continue
-
-        old_values = old_schema[current_name]["values"]
-        for current_value, current_value_data in current_data["values"].items():
-            if not current_value_data["deprecated"] or current_value not in old_values:
-                continue
-
-            if (
-                current_value_data["deprecated"]
-                != old_values[current_value]["deprecated"]
-            ):
-                differences.append(
-                    {
-                        "diff": "enum_value_deprecated",
-                        "enum": current_name,
-                        "value": current_value,
-                        "version": current_value_data["deprecated"],
-                    }
-                )
-
-    return differences
-
-
-def find_new_unions_types(old_schema, current_schema) -> list:
-    differences = []
-    for current_name, current_data in current_schema.items():
-        if current_data["type"] != "union":
-            continue
-
-        if (
-            current_name not in old_schema
-            or current_data["type"] != old_schema[current_name]["type"]
-        ):
-            continue
-
-        old_types = old_schema[current_name]["types"]
-        for current_type in current_data["types"]:
-            if current_type not in old_types:
-                differences.append(
-                    {
-                        "diff": "union_type_new",
-                        "union": current_name,
-                        "type": current_type,
-                    }
-                )
-
-    return differences
-
-
-def find_deleted_unions_types(old_schema, current_schema) -> list:
-    differences = []
-    for current_name, current_data in current_schema.items():
-        if current_data["type"] != "union":
-            continue
-
-        if (
-            current_name not in old_schema
-            or current_data["type"] != old_schema[current_name]["type"]
-        ):
-            continue
-
-        for old_type in old_schema[current_name]["types"]:
-            if old_type not in current_data["types"]:
-                differences.append(
-                    {
-                        "diff": "union_type_deleted",
-                        "union": current_name,
-                        "type": old_type,
-                    }
+            for rule in changed_rules:
+                values = rule.compare(old_member_data, member_data)
+                if values is not None:
+                    yield rule.get_record((*names, member), values)
+
+            if children:
+                yield from diff_members(
+                    table,
+                    type_kind,
+                    members_path,
+                    (*names, member),
+                    old_member_data,
+                    member_data,
                 )
 
-    return differences
+        if deleted_rules:
+            for member in old_members:
+                if member not in current_members:
+                    for rule in deleted_rules:
+                        yield rule.get_record((*names, member))
+
+
+def get_members(data: dict, collection: str) -> dict:
+    members = data[collection]
+    # Union members are listed by name only
+    if isinstance(members, list):
+        return dict.fromkeys(members)
+    return members
+
+
+def is_unchanged(old_data: dict | None, current_data: dict | None) -> bool:
+    # Hashes built by schema_builder cover whole subtrees. Data without them,
+    # like snapshots stored before they were added, is compared in full.
+    old_hash = old_data.get("hash") if old_data else None
+    current_hash = current_data.get("hash") if current_data else None
+    if old_hash is None or current_hash is None:
+        return old_data == current_data
+    return old_hash == current_hash
@@ -1,15 +1,58 @@
+import codecs
+import hashlib
+
 import requests
 
 from . import exceptions
-
+from .http_session import get_conditional_headers, get_validators
 
 HEADER_CONTENT_TYPE = "Content-Type"
+HEADER_CONTENT_LENGTH = "Content-Length"
 REQUIRED_CONTENT_TYPE = "text/plain"
 REQUIRED_CHARSET = "utf-8"
 
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def download_schema(
+    schema_url: str,
+    validators: dict | None = None,
+    stream: bool = False,
+    max_size: int | None = None,
+    session: requests.Session | None = None,
+    timeout: float | tuple[float, float] | None = None,
+) -> str | None:
+    r = (session or requests).get(
+        schema_url,
+        # Conditional request only makes sense if schema was seen before
+        headers=get_conditional_headers(
+            validators if validators and validators.get("digest") else None
+        ),
+        stream=stream,
+        timeout=timeout,
+    )
+    with r:
+        # Schema didn't change since validators were stored
+        if validators is not None and r.status_code == 304:
+            return None
+
+        validate_schema_response(r, max_size)
+        if stream:
+            schema, digest = read_schema_stream(r, max_size)
+        else:
+            schema, digest = read_schema_content(r, max_size)
 
-def download_schema(schema_url: str) -> str:
-    r = requests.get(schema_url)
+    if validators is not None:
+        unchanged = digest == validators.get("digest")
+        validators.update(get_validators(r))
+        validators["digest"] = digest
+        if unchanged:
+            return None
+
+    return schema
+
+
+def validate_schema_response(r: requests.Response, max_size: int | None):
     if r.status_code != 200:
         raise exceptions.SchemaDownloadHTTPStatusCodeError(r.status_code)
     if HEADER_CONTENT_TYPE not in r.headers:
@@ -27,7 +70,37 @@ def download_schema(schema_url: str) -> str:
     if charset != REQUIRED_CHARSET:
         raise exceptions.SchemaDownloadCharsetInvalidError(charset)
 
+    content_length = r.headers.get(HEADER_CONTENT_LENGTH)
+    if max_size and content_length and int(content_length) > max_size:
+        raise exceptions.SchemaDownloadTooLargeError(max_size)
+
+
+def read_schema_content(r: requests.Response, max_size: int | None):
     if not r.content:
         raise exceptions.SchemaDownloadEmptyError()
+    if max_size and len(r.content) > max_size:
+        raise exceptions.SchemaDownloadTooLargeError(max_size)
+
+    digest = hashlib.sha256(r.content).hexdigest()
+    return r.content.decode(REQUIRED_CHARSET), digest
+
+
+def read_schema_stream(r: requests.Response, max_size: int | None):
+    decoder = codecs.getincrementaldecoder(REQUIRED_CHARSET)()
+    digest = hashlib.sha256()
+    chunks: list[str] = []
+    size = 0
+
+    for chunk in r.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+        size += len(chunk)
+        if max_size and size > max_size:
+            raise exceptions.SchemaDownloadTooLargeError(max_size)
+
+        digest.update(chunk)
+        chunks.append(decoder.decode(chunk))
+
+    if not size:
+        raise exceptions.SchemaDownloadEmptyError()
 
-    return r.content.decode(REQUIRED_CHARSET)
+    chunks.append(decoder.decode(b"", final=True))
+    return "".join(chunks), digest.hexdigest()
@@ -0,0 +1,91 @@
+import re
+from typing import Iterable
+
+TYPE_NAME_RE = re.compile(r"[_A-Za-z][_0-9A-Za-z]*")
+
+# Diff kinds with impact, mapped to the schema in which their type still exists
+IMPACT_DIFFS = {"type_deleted": "old", "type_deprecated": "current"}
+
+
+class SchemaGraph:
+    def __init__(self, schema_json: dict):
+        self.schema = schema_json
+        self.references: dict[str, list[dict]] = {}
+
+        for type_name, type_data in schema_json.items():
+            for interface in type_data.get("interfaces") or ():
+                self.add_reference(
+                    interface, {"relation": "interface", "type": type_name}
+                )
+            for member in type_data.get("types") or ():
+                self.add_reference(member, {"relation": "union", "type": type_name})
+
+            for field_name, field_data in type_data.get("fields", {}).items():
+                self.add_reference(
+                    get_named_type(field_data["type"]),
+                    {"relation": "field", "type": type_name, "field": field_name},
+                )
+                for argument, argument_data in field_data.get("arguments", {}).items():
+                    self.add_reference(
+                        get_named_type(argument_data["type"]),
+                        {
+                            "relation": "argument",
+                            "type": type_name,
+                            "field": field_name,
+                            "argument": argument,
+                        },
+                    )
+
+    def add_reference(self, type_name: str, reference: dict):
+        self.references.setdefault(type_name, []).append(reference)
+
+    def get_references(self, type_name: str) -> list[dict]:
+        return self.references.get(type_name, [])
+
+    def get_dependants(self, type_names: Iterable[str]) -> set[str]:
+        type_names = set(type_names)
+        dependants = set()
+        queue = list(type_names)
+        while queue:
+            for reference in self.get_references(queue.pop()):
+                if reference["type"] not in dependants:
+                    dependants.add(reference["type"])
+                    queue.append(reference["type"])
+        # Types referencing themselves through cycles don't depend on themselves
+        return dependants - type_names
+
+    def get_deprecated_references(self) -> list[dict]:
+        references = []
+        for type_name, type_data in self.schema.items():
+            if type_data["deprecated"]:
+                references += [
+                    {**reference, "target": type_name}
+                    for reference in self.get_references(type_name)
+                ]
+        return references
+
+    def get_impact(self, type_name: str) -> dict:
+        # Only direct references are listed, transitive dependants of nearly
+        # every type reach Query and Mutation
+        references = [
+            reference
+            for reference in self.get_references(type_name)
+            if reference["type"] != type_name
+        ]
+        return {
+            "references": references,
+            "dependants": sorted({reference["type"] for reference in references}),
+        }
+
+
+def get_named_type(type_str: str) -> str:
+    return TYPE_NAME_RE.search(type_str)[0]
+
+
+def attach_impact(diff: list, old_graph: SchemaGraph, current_graph: SchemaGraph):
+    graphs = {"old": old_graph, "current": current_graph}
+    for record in diff:
+        if record["diff"] in IMPACT_DIFFS:
+            graph = graphs[IMPACT_DIFFS[record["diff"]]]
+            record["impact"] = graph.get_impact(record["type"])
+    return diff
@@ -0,0 +1,243 @@
+from typing import Callable, Iterator
+
+Intern = Callable[[str | None], str | None]
+
+
+class StringTable:
+    __slots__ = ("strings",)
+
+    def __init__(self):
+        self.strings: dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+    def intern(self, value: str | None) -> str | None:
+        if value is None:
+            return None
+        return self.strings.setdefault(value, value)
+
+
+class EnumValueRecord:
+    __slots__ = ("description", "deprecated", "message")
+
+    def __init__(self, description, deprecated, message):
+        self.description = description
+        self.deprecated = deprecated
+        self.message = message
+
+    @classmethod
+    def from_json(cls, data: dict, intern: Intern) -> "EnumValueRecord":
+        return cls(
+            intern(data["description"]),
+            intern(data["deprecated"]),
+            intern(data["message"]),
+        )
+
+    def to_json(self) -> dict:
+        return {
+            "description": self.description,
+            "deprecated": self.deprecated,
+            "message": self.message,
+        }
+
+
+class InputValueRecord:
+    __slots__ = ("type", "description", "deprecated", "message", "default", "hash")
+
+    def __init__(self, type, description, deprecated, message, default, hash=None):
+        self.type = type
+        self.description = description
+        self.deprecated = deprecated
+        self.message = message
+        self.default = default
+        self.hash = hash
+
+    @classmethod
+    def from_json(cls, data: dict, intern: Intern) -> "InputValueRecord":
+        default = data["default"]
+        return cls(
+            intern(data["type"]),
+            intern(data["description"]),
+            intern(data["deprecated"]),
+            intern(data["message"]),
+            intern(default) if isinstance(default, str) else default,
+            data.get("hash"),
+        )
+
+    def to_json(self) -> dict:
+        return add_hash(
+            {
+                "type": self.type,
+                "description": self.description,
+                "deprecated": self.deprecated,
+                "message": self.message,
+                "default": self.default,
+            },
+            self.hash,
+        )
+
+
+class FieldRecord:
+    __slots__ = ("type", "description", "deprecated", "message", "arguments", "hash")
+
+    def __init__(self, type, description, deprecated, message, arguments, hash=None):
+        self.type = type
+        self.description = description
+        self.deprecated = deprecated
+        self.message = message
+        self.arguments: dict[str, InputValueRecord] = arguments
+        self.hash = hash
+
+    @classmethod
+    def from_json(cls, data: dict, intern: Intern) -> "FieldRecord":
+        return cls(
+            intern(data["type"]),
+            intern(data["description"]),
+            intern(data["deprecated"]),
+            intern(data["message"]),
+            {
+                intern(name): InputValueRecord.from_json(argument, intern)
+                for name, argument in data["arguments"].items()
+            },
+            data.get("hash"),
+        )
+
+    def to_json(self) -> dict:
+        return add_hash(
+            {
+                "type": self.type,
+                "description": self.description,
+                "deprecated": self.deprecated,
+                "message": self.message,
+                "arguments": members_to_json(self.arguments),
+            },
+            self.hash,
+        )
+
+
+class TypeRecord:
+    __slots__ = (
+        "kind",
+        "description",
+        "deprecated",
+        "message",
+        "interfaces",
+        "members",
+        "types",
+        "hash",
+    )
+
+    def __init__(
+        self,
+        kind,
+        description,
+        deprecated,
+        message,
+        interfaces=None,
+        members=None,
+        types=None,
+        hash=None,
+    ):
+        self.kind = kind
+        self.description = description
+        self.deprecated = deprecated
+        self.message = message
+        self.interfaces: tuple[str, ...] | None = interfaces
+        # Fields or enum values, kept in insertion order until serialized
+        self.members: dict | None = members
+        self.types: tuple[str, ...] | None = types
+        # Covers the whole type, see schema_builder.get_node_hash
+        self.hash: str | None = hash
+
+    @classmethod
+    def from_json(cls, data: dict, intern: Intern) -> "TypeRecord":
+        kind = data["type"]
+        members = None
+        if kind in MEMBER_RECORDS:
+            member_record = MEMBER_RECORDS[kind]
+            members_key = "values" if kind == "enum" else "fields"
+            members = {
+                intern(name): member_record.from_json(member, intern)
+                for name, member in data[members_key].items()
+            }
+
+        interfaces = data.get("interfaces")
+        types = data.get("types")
+        return cls(
+            intern(kind),
+            intern(data["description"]),
+            intern(data["deprecated"]),
+            intern(data["message"]),
+            interfaces=(
+                tuple(map(intern, interfaces)) if interfaces is not None else None
+            ),
+            members=members,
+            types=tuple(map(intern, types)) if types is not None else None,
+            hash=data.get("hash"),
+        )
+
+    def to_json(self) -> dict:
+        type_json = {"type": self.kind}
+        if self.interfaces is not None:
+            type_json["interfaces"] = list(self.interfaces)
+        type_json.update(
+            {
+                "description": self.description,
+                "deprecated": self.deprecated,
+                "message": self.message,
+            }
+        )
+        if self.kind == "enum":
+            type_json["values"] = members_to_json(self.members)
+        elif self.members is not None:
+            type_json["fields"] = members_to_json(self.members)
+        if self.types is not None:
+            type_json["types"] = list(self.types)
+        return add_hash(type_json, self.hash)
+
+
+MEMBER_RECORDS = {
+    "object": FieldRecord,
+    "interface": FieldRecord,
+    "input": InputValueRecord,
+    "enum": EnumValueRecord,
+}
+
+
+class SchemaModel:
+    __slots__ = ("types", "strings")
+
+    def __init__(
+        self,
+        types: dict[str, TypeRecord] | None = None,
+        strings: StringTable | None = None,
+    ):
+        self.types: dict[str, TypeRecord] = {} if types is None else types
+        self.strings = strings or StringTable()
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def __contains__(self, type_name: str) -> bool:
+        return type_name in self.types
+
+    def __getitem__(self, type_name: str) -> TypeRecord:
+        return self.types[type_name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(sorted(self.types))
+
+    def to_json(self) -> dict:
+        return members_to_json(self.types)
+
+
+def members_to_json(members: dict) -> dict:
+    return {name: members[name].to_json() for name in sorted(members)}
+
+
+def add_hash(data: dict, node_hash: str | None) -> dict:
+    # Data read from blobs stored before hashes were built has none
+    if node_hash is not None:
+        data["hash"] = node_hash
+    return data
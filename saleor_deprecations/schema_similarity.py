@@ -0,0 +1,119 @@
+import hashlib
+import random
+import re
+
+NUM_PERMUTATIONS = 32
+# Pairs become candidates around Jaccard (1 / BANDS) ** (1 / ROWS), 0.25 here,
+# so nearly all pairs at RENAME_THRESHOLD are found and then checked exactly
+BANDS = 16
+ROWS = NUM_PERMUTATIONS // BANDS
+MERSENNE_PRIME = (1 << 61) - 1
+RENAME_THRESHOLD = 0.5
+
+WORD_RE = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+")
+
+_permutations_random = random.Random(0)
+PERMUTATIONS = [
+    (
+        _permutations_random.randrange(1, MERSENNE_PRIME),
+        _permutations_random.randrange(0, MERSENNE_PRIME),
+    )
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+
+class SimilarityIndex:
+    def __init__(self):
+        self.buckets: dict[tuple, list] = {}
+        self.signatures: dict = {}
+
+    def add(self, key, tokens: set[str], group: str = ""):
+        self.signatures[key] = tokens
+        for band in get_bands(tokens):
+            self.buckets.setdefault((group, band), []).append(key)
+
+    def query(self, tokens: set[str], group: str = "") -> set:
+        candidates = set()
+        for band in get_bands(tokens):
+            candidates.update(self.buckets.get((group, band), ()))
+        return candidates
+
+
+def get_minhash(tokens: set[str]) -> list[int]:
+    values = [
+        int.from_bytes(hashlib.blake2b(t.encode(), digest_size=8).digest(), "big")
+        for t in tokens
+    ]
+    if not values:
+        return [MERSENNE_PRIME] * NUM_PERMUTATIONS
+    return [min((a * v + b) % MERSENNE_PRIME for v in values) for a, b in PERMUTATIONS]
+
+
+def get_bands(tokens: set[str]) -> list[tuple]:
+    minhash = get_minhash(tokens)
+    return [(band, *minhash[band * ROWS : (band + 1) * ROWS]) for band in range(BANDS)]
+
+
+def get_jaccard(tokens: set[str], other_tokens: set[str]) -> float:
+    if not tokens and not other_tokens:
+        return 1.0
+    return len(tokens & other_tokens) / len(tokens | other_tokens)
+
+
+def get_name_tokens(name: str) -> set[str]:
+    return {f"name:{word.lower()}" for word in WORD_RE.findall(name)}
+
+
+def get_text_tokens(text: str | None) -> set[str]:
+    if not text:
+        return set()
+    return {f"text:{word.lower()}" for word in WORD_RE.findall(text)}
+
+
+def get_type_tokens(type_name: str, type_data: dict) -> set[str]:
+    tokens = get_name_tokens(type_name) | get_text_tokens(type_data["description"])
+    for field_name, field_data in type_data.get("fields", {}).items():
+        tokens.add(f"field:{field_name}:{field_data['type']}")
+    for value in type_data.get("values", {}):
+        tokens.add(f"value:{value}")
+    for member in type_data.get("types", ()):
+        tokens.add(f"member:{member}")
+    for interface in type_data.get("interfaces", ()):
+        tokens.add(f"interface:{interface}")
+    return tokens
+
+
+def get_field_tokens(field_name: str, field_data: dict) -> set[str]:
+    tokens = get_name_tokens(field_name) | get_text_tokens(field_data["description"])
+    tokens.add(f"type:{field_data['type']}")
+    for argument, argument_data in field_data.get("arguments", {}).items():
+        tokens.add(f"argument:{argument}:{argument_data['type']}")
+    return tokens
+
+
+def match_similar(
+    old_items: dict[tuple, set[str]],
+    new_items: dict[tuple, set[str]],
+    threshold: float = RENAME_THRESHOLD,
+) -> list[tuple[tuple, tuple]]:
+    # Keys are (group, name) pairs, only items from the same group are matched
+    index = SimilarityIndex()
+    for key, tokens in old_items.items():
+        index.add(key, tokens, key[0])
+
+    candidates = []
+    for key, tokens in new_items.items():
+        for old_key in index.query(tokens, key[0]):
+            score = get_jaccard(index.signatures[old_key], tokens)
+            if score >= threshold:
+                candidates.append((score, old_key, key))
+
+    matches = []
+    matched_old = set()
+    matched_new = set()
+    for _, old_key, key in sorted(candidates, key=lambda c: (-c[0], c[1], c[2])):
+        if old_key not in matched_old and key not in matched_new:
+            matched_old.add(old_key)
+            matched_new.add(key)
+            matches.append((old_key, key))
+    return matches
@@ -0,0 +1,170 @@
+from typing import Iterable, Iterator
+
+from .history_store import HistoryStore
+from .schema_diff import DIFF_KINDS, diff_schemas
+from .schema_model import TypeRecord
+
+
+class SchemaTimeline:
+    def __init__(self, history_store: HistoryStore, snapshot_ids: list | None = None):
+        self.history_store = history_store
+        self.snapshot_ids = (
+            history_store.get_index() if snapshot_ids is None else list(snapshot_ids)
+        )
+        self.positions = {i: pos for pos, i in enumerate(self.snapshot_ids)}
+        self.diffs: dict[tuple[str, str], list[dict]] = {}
+
+    def get_range(self, start_id: str | None = None, end_id: str | None = None):
+        start = self.get_position(start_id) if start_id else 0
+        end = self.get_position(end_id) if end_id else len(self.snapshot_ids) - 1
+        if start > end:
+            raise ValueError(f"Snapshot {start_id} is newer than {end_id}")
+
+        snapshot_ids = self.snapshot_ids[start : end + 1]
+        self.history_store.load_manifests(snapshot_ids)
+        return snapshot_ids
+
+    def get_position(self, snapshot_id: str) -> int:
+        if snapshot_id not in self.positions:
+            raise ValueError(f"Unknown history snapshot: {snapshot_id}")
+        return self.positions[snapshot_id]
+
+    def diff(self, old_id: str, current_id: str) -> list[dict]:
+        key = (old_id, current_id)
+        if key not in self.diffs:
+            old_types = self.history_store.get_manifest(old_id)["types"]
+            current_types = self.history_store.get_manifest(current_id)["types"]
+
+            # Only types with different blobs can produce differences
+            changed = {
+                name
+                for name, type_hash in current_types.items()
+                if old_types.get(name) != type_hash
+            }
+            changed.update(name for name in old_types if name not in current_types)
+
+            old_schema = get_types_json(self.load_types(old_id, changed))
+            current_schema = get_types_json(self.load_types(current_id, changed))
+            self.diffs[key] = diff_schemas(old_schema, current_schema)
+
+        return self.diffs[key]
+
+    def diff_range(
+        self, start_id: str | None = None, end_id: str | None = None
+    ) -> list[dict]:
+        snapshot_ids = self.get_range(start_id, end_id)
+        return self.diff(snapshot_ids[0], snapshot_ids[-1])
+
+    def iter_changes(
+        self,
+        start_id: str | None = None,
+        end_id: str | None = None,
+        kinds: Iterable[str] | None = None,
+        types: Iterable[str] | None = None,
+    ) -> Iterator[tuple[str, dict]]:
+        kinds = frozenset(DIFF_KINDS if kinds is None else kinds)
+        types = frozenset(types) if types is not None else None
+        snapshot_ids = self.get_range(start_id, end_id)
+
+        # Steps between consecutive snapshots are cached and shared by all ranges
+        for old_id, current_id in zip(snapshot_ids, snapshot_ids[1:]):
+            for diff in self.diff(old_id, current_id):
+                if diff["diff"] in kinds and (
+                    types is None or get_diff_type(diff) in types
+                ):
+                    yield current_id, diff
+
+    def get_member_timeline(
+        self,
+        type_name: str,
+        member: str | None = None,
+        argument: str | None = None,
+        start_id: str | None = None,
+        end_id: str | None = None,
+    ) -> list[dict]:
+        timeline = []
+        previous_hash = None
+        previous_state = None
+        for snapshot_id in self.get_range(start_id, end_id):
+            type_hash = self.history_store.get_manifest(snapshot_id)["types"].get(
+                type_name
+            )
+            # Unchanged blob means unchanged member, no need to load it
+            if type_hash == previous_hash and timeline:
+                continue
+
+            state = None
+            if type_hash:
+                type_record = self.history_store.get_type(snapshot_id, type_name)
+                state = get_member_state(type_record, member, argument)
+
+            if state != previous_state:
+                timeline.append(get_timeline_event(snapshot_id, previous_state, state))
+            previous_hash = type_hash
+            previous_state = state
+
+        return timeline
+
+    def load_types(
+        self, snapshot_id: str, type_names: set[str]
+    ) -> dict[str, TypeRecord]:
+        # Types are kept in snapshot order, so diffs are ordered like full diffs
+        types = {
+            name: type_hash
+            for name, type_hash in self.history_store.get_manifest(snapshot_id)[
+                "types"
+            ].items()
+            if name in type_names
+        }
+        self.history_store.load_blobs(types.values())
+        return {
+            name: self.history_store.blobs[type_hash]
+            for name, type_hash in types.items()
+        }
+
+
+def get_types_json(types: dict[str, TypeRecord]) -> dict:
+    # Only types that are diffed are converted back to JSON
+    return {name: type_record.to_json() for name, type_record in types.items()}
+
+
+def get_member_state(
+    type_record: TypeRecord, member: str | None, argument: str | None
+) -> tuple | None:
+    if member is None:
+        return (type_record.kind, type_record.deprecated, type_record.message)
+
+    record = (type_record.members or {}).get(member)
+    if record is not None and argument is not None:
+        record = getattr(record, "arguments", {}).get(argument)
+    if record is None:
+        return None
+
+    return (getattr(record, "type", None), record.deprecated, record.message)
+
+
+def get_timeline_event(
+    snapshot_id: str, previous_state: tuple | None, state: tuple | None
+) -> dict:
+    if state is None:
+        return {"snapshot": snapshot_id, "event": "deleted"}
+
+    event = {
+        "snapshot": snapshot_id,
+        "type": state[0],
+        "deprecated": state[1],
+        "message": state[2],
+    }
+    if previous_state is None:
+        event["event"] = "added"
+    elif state[1] and state[1] != previous_state[1]:
+        event["event"] = "deprecated"
+    elif not state[1] and previous_state[1]:
+        event["event"] = "undeprecated"
+    else:
+        event["event"] = "changed"
+    return event
+
+
+def get_diff_type(diff: dict) -> str:
+    return diff.get("enum") or diff.get("union") or diff["type"]
@@ -0,0 +1,61 @@
+import gzip
+import json
+import lzma
+from dataclasses import dataclass
+from typing import Callable
+
+
+@dataclass(frozen=True)
+class SnapshotCodec:
+    name: str
+    magic: bytes | None = None
+    compress: Callable[[bytes], bytes] | None = None
+    decompress: Callable[[bytes], bytes] | None = None
+
+
+CODECS = {
+    codec.name: codec
+    for codec in (
+        SnapshotCodec(name="json"),
+        SnapshotCodec(
+            name="gzip",
+            magic=b"\x1f\x8b",
+            # Fixed mtime keeps output stable for unchanged data
+            compress=lambda data: gzip.compress(data, mtime=0),
+            decompress=gzip.decompress,
+        ),
+        SnapshotCodec(
+            name="lzma",
+            magic=b"\xfd7zXZ\x00",
+            compress=lzma.compress,
+            decompress=lzma.decompress,
+        ),
+    )
+}
+
+DEFAULT_CODEC = "json"
+# Codec is detected from content, so every codec shares one file name per key
+SNAPSHOT_EXTENSION = ".json"
+
+
+def get_codec(name: str) -> SnapshotCodec:
+    if name not in CODECS:
+        raise ValueError(f"Unknown snapshot codec: {name}")
+
+    return CODECS[name]
+
+
+def encode_snapshot(data: dict | list, codec: SnapshotCodec) -> bytes:
+    content = json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode()
+    if codec.compress:
+        return codec.compress(content)
+    return content
+
+
+def decode_snapshot(content: bytes) -> dict | list:
+    for codec in CODECS.values():
+        if codec.magic and content.startswith(codec.magic):
+            content = codec.decompress(content)
+            break
+
+    return json.loads(content)
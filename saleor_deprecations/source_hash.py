@@ -0,0 +1,27 @@
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable
+
+import graphql
+import jinja2
+
+PACKAGE_DIR = Path(__file__).parent
+
+
+def get_files_hash(paths: Iterable[Path], *salt) -> str:
+    files_hash = hashlib.sha256(":".join(map(str, salt)).encode())
+    for path in sorted(paths):
+        files_hash.update(path.name.encode())
+        files_hash.update(path.read_bytes())
+    return files_hash.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def get_package_hash() -> str:
+    # Changes whenever code, templates or dependencies that shape output change
+    return get_files_hash(
+        [*PACKAGE_DIR.rglob("*.py"), *PACKAGE_DIR.glob("templates/*.html")],
+        graphql.version,
+        jinja2.__version__,
+    )
@@ -0,0 +1,92 @@
+from graphql import parse
+
+from saleor_deprecations import build_schema_data, diff_schemas
+
+OLD_SCHEMA = """
+type Order {
+  id: ID!
+  total(currency: String = "USD"): Float
+  lines: [String!]!
+}
+
+type Legacy {
+  id: ID!
+}
+
+enum Status {
+  OPEN
+  CLOSED
+}
+"""
+
+CURRENT_SCHEMA = """
+type Order {
+  id: ID!
+  total(
+    currency: String @deprecated(reason: "Will be removed in Saleor 3.22.")
+  ): Float
+  lines: [String!]!
+}
+
+enum Status {
+  OPEN
+  CLOSED @deprecated(reason: "Will be removed in Saleor 3.22.")
+}
+"""
+
+
+def get_schema_json(schema_sdl: str) -> dict:
+    return build_schema_data(parse(schema_sdl))[1]
+
+
+def test_builder_hashes_match_only_for_equal_nodes():
+    old_schema = get_schema_json(OLD_SCHEMA)
+    current_schema = get_schema_json(CURRENT_SCHEMA)
+
+    old_fields = old_schema["Order"]["fields"]
+    current_fields = current_schema["Order"]["fields"]
+    assert old_fields["lines"]["hash"] == current_fields["lines"]["hash"]
+    assert old_fields["total"]["hash"] != current_fields["total"]["hash"]
+    assert old_schema["Order"]["hash"] != current_schema["Order"]["hash"]
+    assert old_schema["Status"]["hash"] != current_schema["Status"]["hash"]
+
+
+def test_diff_schemas_reports_deleted_types_and_changed_members():
+    diff = diff_schemas(get_schema_json(OLD_SCHEMA), get_schema_json(CURRENT_SCHEMA))
+
+    assert diff == [
+        {"diff": "type_deleted", "type": "Legacy"},
+        {
+            "diff": "argument_deprecated",
+            "type": "Order",
+            "field": "total",
+            "argument": "currency",
+            "version": "3.22",
+        },
+        {
+            "diff": "enum_value_deprecated",
+            "enum": "Status",
+            "value": "CLOSED",
+            "version": "3.22",
+        },
+    ]
+
+
+def test_diff_schemas_skips_members_with_equal_hashes():
+    old_schema = get_schema_json(OLD_SCHEMA)
+    current_schema = get_schema_json(OLD_SCHEMA)
+    # Data is only compared when hashes differ
+    current_schema["Order"]["fields"]["lines"]["deprecated"] = "3.22"
+
+    assert diff_schemas(old_schema, current_schema) == []
+
+
+def test_diff_schemas_compares_data_without_hashes():
+    old_schema = get_schema_json(OLD_SCHEMA)
+    current_schema = get_schema_json(CURRENT_SCHEMA)
+    for type_data in old_schema.values():
+        del type_data["hash"]
+
+    assert diff_schemas(old_schema, current_schema) == diff_schemas(
+        get_schema_json(OLD_SCHEMA), current_schema
+    )
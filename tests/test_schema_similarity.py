@@ -0,0 +1,41 @@
+from saleor_deprecations.schema_similarity import RENAME_THRESHOLD, match_similar
+
+
+def get_tokens_pair(i: int, shared: int, unique: int) -> tuple[set, set]:
+    common = {f"common:{i}:{n}" for n in range(shared)}
+    return (
+        common | {f"old:{i}:{n}" for n in range(unique)},
+        common | {f"new:{i}:{n}" for n in range(unique)},
+    )
+
+
+def test_match_similar_finds_pairs_at_rename_threshold():
+    # 6 shared and 3 unique tokens on each side is Jaccard 0.5
+    old_items = {}
+    new_items = {}
+    for i in range(200):
+        old_tokens, new_tokens = get_tokens_pair(i, shared=6, unique=3)
+        assert len(old_tokens & new_tokens) / len(old_tokens | new_tokens) == 0.5
+        old_items[("object", f"Old{i}")] = old_tokens
+        new_items[("object", f"New{i}")] = new_tokens
+
+    matches = match_similar(old_items, new_items, RENAME_THRESHOLD)
+
+    expected = {(("object", f"Old{i}"), ("object", f"New{i}")) for i in range(200)}
+    assert len(expected.intersection(matches)) >= 190
+    assert set(matches) <= expected
+
+
+def test_match_similar_skips_pairs_below_threshold():
+    old_tokens, new_tokens = get_tokens_pair(0, shared=2, unique=3)
+
+    assert (
+        match_similar({("object", "Old"): old_tokens}, {("object", "New"): new_tokens})
+        == []
+    )
+
+
+def test_match_similar_only_matches_within_group():
+    tokens = {"name:order", "field:id:ID!"}
+
+    assert match_similar({("enum", "Old"): tokens}, {("object", "New"): tokens}) == []